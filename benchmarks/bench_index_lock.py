@@ -0,0 +1,143 @@
+"""Run a CLI scan and daemon rescans while another process holds a write on the shared index.
+
+The GUI, the CLI and the index daemon share one SQLite index. A second process holding
+a write transaction must neither hide projects from `menu_app scan` nor make it report
+a root as unreadable, and the scan must finish well within the probe timeout. A
+`menu_app serve` daemon rescanning under the same held write must keep serving every
+project.
+
+    python benchmarks/bench_index_lock.py                  # 300 projects, 8s held write
+    python benchmarks/bench_index_lock.py --projects 1000 --hold 20
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+ROOT_DIR = os.path.dirname(BENCH_DIR)
+sys.path.insert(0, ROOT_DIR)
+
+import project_core
+from generate_tree import generate_tree
+
+# Runs in the holding process: start a write transaction and keep it open
+HOLD_WRITE = """
+import sqlite3, sys, time
+conn = sqlite3.connect(sys.argv[1])
+conn.execute("INSERT OR REPLACE INTO git_status VALUES ('held', 1, 1, 'main', 0, 0, 0)")
+print("held", flush=True)
+time.sleep(float(sys.argv[2]))
+conn.rollback()
+"""
+
+MENU_APP = os.path.join(ROOT_DIR, "menu_app.py")
+
+def run_scan(root, env, *options):
+    command = [sys.executable, MENU_APP, "--root", root, *options, "scan", "--json"]
+    started = time.monotonic()
+    result = subprocess.run(command, env=env, capture_output=True, text=True)
+    return result, time.monotonic() - started
+
+def hold_write(index_path, seconds):
+    """Start a process holding a write on the index; returns once the write is held."""
+    holder = subprocess.Popen([sys.executable, "-c", HOLD_WRITE, index_path, str(seconds)],
+                              stdout=subprocess.PIPE, text=True)
+    holder.stdout.readline()
+    return holder
+
+def stop(process):
+    process.kill()
+    process.wait()
+
+def check_daemon(root, env, index_path, expected, hold):
+    """Let a daemon rescan through a held write; return the projects served and any failures."""
+    info_path = os.path.join(os.path.dirname(index_path), "index_daemon.json")
+    daemon = subprocess.Popen([sys.executable, MENU_APP, "--root", root, "serve",
+                               "--interval", "0.5"],
+                              env=env, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True)
+    try:
+        deadline = time.monotonic() + 30
+        while not os.path.exists(info_path) and time.monotonic() < deadline:
+            time.sleep(0.1)
+        run_scan(root, env)  # waits for the daemon's first scan
+        holder = hold_write(index_path, hold)
+        try:
+            touched = next(entry.path for entry in os.scandir(root) if entry.is_dir())
+            os.utime(touched)
+            time.sleep(hold / 2)  # several rescans while the write is held
+            result, _ = run_scan(root, env)
+        finally:
+            stop(holder)
+    finally:
+        stop(daemon)
+    found = len(json.loads(result.stdout)) if result.returncode == 0 else 0
+    failures = []
+    if found != expected:
+        failures.append(f"daemon served {found} of {expected} projects")
+    errors = [line for line in daemon.stderr.read().splitlines() if line.startswith("Error")]
+    if errors:
+        failures.append(f"daemon reported {errors[0]!r}")
+    return found, failures
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--projects", type=int, default=300)
+    parser.add_argument("--hold", type=float, default=8.0,
+                        help="seconds the other process keeps its write open")
+    parser.add_argument("--workdir", default=os.path.join(tempfile.gettempdir(), "menu_app_bench"),
+                        help="where synthetic roots are generated and reused")
+    args = parser.parse_args(argv)
+
+    root = os.path.join(args.workdir, f"root-{args.projects}")
+    if not os.path.isdir(root):
+        generate_tree(root, args.projects, seed=args.projects)
+
+    failures = []
+    with tempfile.TemporaryDirectory() as config_dir:
+        # The index lives in the settings directory
+        env = dict(os.environ, XDG_CONFIG_HOME=config_dir, APPDATA=config_dir)
+        expected, _ = run_scan(root, env, "--no-index")
+        expected = len(json.loads(expected.stdout))
+        warm, _ = run_scan(root, env, "--no-daemon")  # creates and fills the index
+        if warm.returncode != 0:
+            print(warm.stderr, file=sys.stderr)
+            return 1
+
+        index_path = os.path.join(config_dir, project_core.ORGANIZATION, "project_index.sqlite3")
+        holder = hold_write(index_path, args.hold)
+        try:
+            # Touch a project so the scan has something to write back
+            touched = next(entry.path for entry in os.scandir(root) if entry.is_dir())
+            os.utime(touched)
+            result, elapsed = run_scan(root, env, "--no-daemon")
+        finally:
+            stop(holder)
+        served, daemon_failures = check_daemon(root, env, index_path, expected, args.hold)
+
+    found = len(json.loads(result.stdout)) if result.returncode == 0 else 0
+    print(f"expected {expected} projects, found {found} in {elapsed:.2f}s "
+          f"with a write held for {args.hold:g}s (rc {result.returncode})")
+    print(f"daemon served {served} of {expected} projects while the write was held")
+    if result.returncode != 0:
+        failures.append(f"scan exited with {result.returncode}")
+    if found != expected:
+        failures.append(f"scan found {found} of {expected} projects")
+    if "could not be read" in result.stderr:
+        failures.append("a root was reported as unreadable")
+    if elapsed >= project_core.PROBE_TIMEOUT:
+        failures.append(f"scan took {elapsed:.2f}s, at least the {project_core.PROBE_TIMEOUT:g}s "
+                        f"probe timeout")
+    failures += daemon_failures
+    for failure in failures:
+        print(f"FAIL {failure}")
+    if result.stderr.strip():
+        print(result.stderr, file=sys.stderr)
+    return 1 if failures else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,165 @@
+"""Reload the project grid repeatedly and check that nothing it creates is left behind.
+
+Runs ProjectMenu under the offscreen Qt platform on a synthetic root. Each cycle saves
+the settings dialog (which reloads the grid), hovers a card, opens the performance
+panel and waits for every background pass to finish. After a few warm-up cycles the
+top-level widget count, the QObject counts and the RSS must stay flat.
+
+    python benchmarks/bench_lifecycle.py                    # 1k projects, 20 reloads
+    python benchmarks/bench_lifecycle.py --projects 200 --reloads 5
+"""
+import argparse
+import gc
+import os
+import sys
+import tempfile
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(BENCH_DIR))
+
+import project_core
+from generate_tree import generate_tree
+
+def current_rss_kb():
+    """Resident set size now (Linux), or the peak RSS elsewhere, which can only grow."""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") // 1024
+    except (OSError, ValueError):
+        pass
+    try:
+        import resource
+    except ImportError:  # Windows
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak // 1024 if sys.platform == "darwin" else peak
+
+class LifecycleHarness:
+    def __init__(self, root, state_dir):
+        from PyQt6.QtCore import QSettings
+        from PyQt6.QtWidgets import QApplication
+        import menu_gui
+
+        self.app = QApplication.instance() or QApplication([])
+        settings = QSettings(os.path.join(state_dir, "settings.ini"), QSettings.Format.IniFormat)
+        settings.setValue("projects_directory", root)
+        self.index = project_core.ProjectIndex(os.path.join(state_dir, "index.sqlite3"))
+        self.window = menu_gui.ProjectMenu(settings=settings, index=self.index,
+                                           snapshot_path=os.path.join(state_dir, "grid_snapshot.json"))
+        self.window.show()
+        self.wait_idle()
+
+    def busy(self):
+        window = self.window
+        return (window.scan_worker is not None or window.reload_timer.isActive()
+                or window.refresh_workers or window.prefetch_workers or window.probe_workers
+                or window.install_workers)
+
+    def wait_idle(self):
+        from PyQt6.QtCore import QEvent, QEventLoop
+        while self.busy():
+            self.app.processEvents(QEventLoop.ProcessEventsFlag.AllEvents, 10)
+        self.app.processEvents()
+        self.app.sendPostedEvents(None, QEvent.Type.DeferredDelete)
+        gc.collect()
+
+    def cycle(self):
+        """One reload as a user would trigger it, plus the widgets used in between."""
+        from PyQt6.QtCore import Qt
+        import menu_gui
+
+        dialog = menu_gui.SettingsDialog(self.window)
+        dialog.setAttribute(Qt.WidgetAttribute.WA_DeleteOnClose)
+        dialog.save_settings()
+        self.wait_idle()
+
+        model = self.window.project_model
+        if model.rowCount():
+            self.window.hover_project(model.index(0))
+            self.window.show_tooltip()
+            self.window.hide_tooltip()
+
+        dialog = menu_gui.PerformanceDialog(self.window)
+        dialog.setAttribute(Qt.WidgetAttribute.WA_DeleteOnClose)
+        dialog.show()
+        dialog.accept()
+        self.wait_idle()
+
+    def counts(self):
+        from PyQt6.QtCore import QObject
+        top_level = self.app.topLevelWidgets()
+        qobjects = len(self.app.findChildren(QObject))
+        qobjects += sum(1 + len(widget.findChildren(QObject)) for widget in top_level)
+        # Parentless QObjects (e.g. worker signals) only show up as Python wrappers
+        wrappers = sum(1 for obj in gc.get_objects() if isinstance(obj, QObject))
+        return {'top_level_widgets': len(top_level), 'qobjects': qobjects,
+                'qobject_wrappers': wrappers, 'rss_kb': current_rss_kb(),
+                'projects': self.window.project_model.rowCount()}
+
+    def close(self):
+        from PyQt6.QtCore import QThreadPool
+        self.window.close()
+        self.window.probe_pool.waitForDone()
+        self.window.install_pool.waitForDone()
+        QThreadPool.globalInstance().waitForDone()
+        self.window.deleteLater()
+        self.app.processEvents()
+        self.index.conn.close()
+
+def check(before, after, rss_tolerance_kb):
+    """Return a list of resources that grew between the two counts."""
+    failures = []
+    for name in ('top_level_widgets', 'qobjects', 'qobject_wrappers'):
+        if after[name] > before[name]:
+            failures.append(f"{name} grew from {before[name]} to {after[name]}")
+    if (before['rss_kb'] is not None
+            and after['rss_kb'] - before['rss_kb'] > rss_tolerance_kb):
+        failures.append(f"RSS grew by {after['rss_kb'] - before['rss_kb']} KB "
+                        f"(allowed {rss_tolerance_kb} KB)")
+    return failures
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--projects", type=int, default=1000)
+    parser.add_argument("--reloads", type=int, default=20)
+    parser.add_argument("--warmup", type=int, default=3,
+                        help="reloads before the baseline is taken (caches fill up)")
+    parser.add_argument("--rss-tolerance-kb", type=int, default=8192)
+    parser.add_argument("--workdir", default=os.path.join(tempfile.gettempdir(), "menu_app_bench"),
+                        help="where synthetic roots are generated and reused")
+    args = parser.parse_args(argv)
+
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+    try:
+        import PyQt6.QtWidgets  # noqa: F401
+    except ImportError as e:
+        print(f"PyQt6 is required: {e}", file=sys.stderr)
+        return 2
+
+    root = os.path.join(args.workdir, f"root-{args.projects}")
+    if not os.path.isdir(root):
+        generate_tree(root, args.projects, seed=args.projects)
+
+    with tempfile.TemporaryDirectory() as state_dir:
+        harness = LifecycleHarness(root, state_dir)
+        for _ in range(args.warmup):
+            harness.cycle()
+        before = harness.counts()
+        for _ in range(args.reloads):
+            harness.cycle()
+        after = harness.counts()
+        harness.close()
+
+    print(f"{'':<20}{'before':>12}{'after':>12}")
+    for name in before:
+        print(f"{name:<20}{before[name]!s:>12}{after[name]!s:>12}")
+    failures = check(before, after, args.rss_tolerance_kb)
+    for failure in failures:
+        print(f"LEAK {failure}")
+    if not failures:
+        print(f"\nNo growth over {args.reloads} reloads")
+    return 1 if failures else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
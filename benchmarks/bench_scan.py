@@ -0,0 +1,301 @@
+"""Time project scanning on synthetic roots and compare the results with a saved baseline.
+
+Each root size runs in its own child process so peak RSS is reported per size.
+
+    python benchmarks/bench_scan.py                      # run and compare with the baselines
+    python benchmarks/bench_scan.py --sizes 100,1000     # smaller run
+    python benchmarks/bench_scan.py --save-baseline      # record new baselines
+
+baseline.json is committed and holds only what is the same on every machine: filesystem
+call and project counts. Timings are compared with baseline.local.json, which
+--save-baseline writes next to it and which stays out of version control.
+"""
+import argparse
+import builtins
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import tracemalloc
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(BENCH_DIR))
+
+import project_core
+from generate_tree import generate_tree
+
+BASELINE_PATH = os.path.join(BENCH_DIR, "baseline.json")
+LOCAL_BASELINE_PATH = os.path.join(BENCH_DIR, "baseline.local.json")
+
+# Result keys that do not depend on the machine running the benchmark
+COUNT_KEYS = ('syscalls', 'projects')
+
+# Broad, selective and fuzzy queries for the search box index
+SEARCH_QUERIES = ["p", "proj", "node", "synthetic", "project-0042", "pj42"]
+
+class SyscallCounter:
+    """Count filesystem calls made through os and open() while active."""
+    FUNCTIONS = ('stat', 'lstat', 'scandir', 'listdir')
+
+    def __init__(self):
+        self.count = 0
+        self.lock = threading.Lock()
+        self.originals = {}
+
+    def wrap(self, function):
+        def counted(*args, **kwargs):
+            with self.lock:
+                self.count += 1
+            return function(*args, **kwargs)
+        return counted
+
+    def __enter__(self):
+        for name in self.FUNCTIONS:
+            self.originals[name] = getattr(os, name)
+            setattr(os, name, self.wrap(self.originals[name]))
+        self.originals['open'] = builtins.open
+        builtins.open = self.wrap(builtins.open)
+        return self
+
+    def __exit__(self, *exc):
+        builtins.open = self.originals.pop('open')
+        for name, function in self.originals.items():
+            setattr(os, name, function)
+        self.originals = {}
+
+def peak_rss_kb():
+    try:
+        import resource
+    except ImportError:  # Windows
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak // 1024 if sys.platform == "darwin" else peak
+
+def measure(function, items, repeat):
+    """Best-of-N seconds and syscalls per item for function(item)."""
+    best = None
+    for _ in range(repeat):
+        with SyscallCounter() as counter:
+            start = time.perf_counter()
+            for item in items:
+                function(item)
+            elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    count = max(len(items), 1)
+    return {'seconds': best / count, 'syscalls': counter.count / count}
+
+def measure_load(root, index_path):
+    index = project_core.ProjectIndex(index_path)
+    with SyscallCounter() as counter:
+        start = time.perf_counter()
+        records = project_core.load_project_records([root], index)
+        elapsed = time.perf_counter() - start
+    index.conn.close()
+    return {'seconds': elapsed, 'syscalls': counter.count, 'projects': len(records)}
+
+def measure_records(root, index_path):
+    """Seconds to load every indexed record, and the memory each one holds once loaded."""
+    index = project_core.ProjectIndex(index_path)
+    start = time.perf_counter()
+    records = index.records_under(root)
+    elapsed = time.perf_counter() - start
+    del records
+    tracemalloc.start()
+    records = index.records_under(root)
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    index.conn.close()
+    return {'seconds': elapsed, 'bytes_per_record': size / max(len(records), 1),
+            'records': len(records)}
+
+def measure_search(root, repeat):
+    """Seconds per uncached query against a search index of the root's projects and READMEs."""
+    index = project_core.ProjectSearchIndex()
+    for record in project_core.load_project_records([root]):
+        if record.readme_path:
+            info = project_core.read_readme_info(record.readme_path, record.name)
+            record.title, record.description = info['title'], info['description']
+        index.add(record)
+
+    def search(query):
+        index.term_cache.clear()
+        return index.search(query)
+    return measure(search, SEARCH_QUERIES, repeat)
+
+def measure_gui_load(root, index_path):
+    """Time ProjectMenu's background load under the offscreen Qt platform.
+
+    A second ProjectMenu opened over the same state paints from the grid snapshot
+    the first one saved, so its first cards appear before its scan starts.
+    """
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+    try:
+        from PyQt6.QtCore import QSettings
+        from PyQt6.QtWidgets import QApplication
+        from menu_gui import ProjectMenu
+    except ImportError as e:
+        print(f"Skipping GUI load benchmark: {e}", file=sys.stderr)
+        return None
+
+    app = QApplication.instance() or QApplication([])
+    settings = QSettings(os.path.join(os.path.dirname(index_path), "settings.ini"),
+                         QSettings.Format.IniFormat)
+    settings.setValue("projects_directory", root)
+    snapshot_path = os.path.join(os.path.dirname(index_path), "grid_snapshot.json")
+    cold = open_gui(app, ProjectMenu, settings, index_path, snapshot_path)
+    warm = open_gui(app, ProjectMenu, settings, index_path, snapshot_path)
+    return cold, warm
+
+def open_gui(app, window_class, settings, index_path, snapshot_path):
+    from PyQt6.QtCore import QEventLoop, QThreadPool
+
+    index = project_core.ProjectIndex(index_path)
+    start = time.perf_counter()
+    window = window_class(settings=settings, index=index, snapshot_path=snapshot_path)
+    first_rows = time.perf_counter() - start if window.project_model.rowCount() else None
+    while window.scan_worker is not None:
+        app.processEvents(QEventLoop.ProcessEventsFlag.AllEvents, 10)
+        if first_rows is None and window.project_model.rowCount():
+            first_rows = time.perf_counter() - start
+    elapsed = time.perf_counter() - start
+    result = {'seconds': elapsed, 'first_cards_seconds': first_rows,
+              'projects': window.project_model.rowCount()}
+    window.close()
+    # Let cancelled background work (e.g. README prefetch) stop before the index goes away
+    window.probe_pool.waitForDone()
+    window.deleteLater()
+    app.processEvents()
+    QThreadPool.globalInstance().waitForDone()
+    index.conn.close()
+    return result
+
+def run_size(size, args):
+    """Benchmark one root size; runs inside a child process."""
+    root = os.path.join(args.workdir, f"root-{size}")
+    if not os.path.isdir(root):
+        generate_tree(root, size, readme_kb=args.readme_kb, seed=size)
+    paths = project_core.list_project_dirs(root)
+    valid = [path for path in paths if project_core.is_valid_project(path)]
+
+    results = {
+        'is_valid_project': measure(project_core.is_valid_project, paths, args.repeat),
+        'detect_project_type': measure(project_core.detect_project_type, valid, args.repeat),
+        'extract_readme_info': measure(project_core.extract_readme_info, valid, args.repeat),
+        'search': measure_search(root, args.repeat),
+    }
+    with tempfile.TemporaryDirectory() as state_dir:
+        index_path = os.path.join(state_dir, "index.sqlite3")
+        results['load_cold'] = measure_load(root, index_path)
+        results['load_warm'] = measure_load(root, index_path)
+        results['index_records'] = measure_records(root, index_path)
+    if not args.no_gui:
+        with tempfile.TemporaryDirectory() as state_dir:
+            gui = measure_gui_load(root, os.path.join(state_dir, "index.sqlite3"))
+            if gui is not None:
+                results['gui_load_cold'], results['gui_load_warm'] = gui
+    results['peak_rss_kb'] = peak_rss_kb()
+    return results
+
+def portable_counts(results):
+    """The machine-independent part of results, as stored in baseline.json."""
+    return {size: {name: {key: value for key, value in values.items() if key in COUNT_KEYS}
+                   for name, values in metrics.items()
+                   if isinstance(values, dict) and 'syscalls' in values}
+            for size, metrics in results.items()}
+
+def compared_metrics(results, baseline):
+    for size, metrics in results.items():
+        for name, values in metrics.items():
+            expected = baseline.get(size, {}).get(name)
+            if isinstance(values, dict) and isinstance(expected, dict):
+                yield f"{size} {name}", values, expected
+
+def compare_counts(results, baseline):
+    """Return the filesystem call counts in results that grew against baseline."""
+    return [f"{label}: {values['syscalls']} syscalls vs baseline {expected['syscalls']}"
+            for label, values, expected in compared_metrics(results, baseline)
+            if 'syscalls' in expected and values.get('syscalls', 0) > expected['syscalls']]
+
+def compare_timings(results, baseline, tolerance):
+    """Return the timings in results more than tolerance slower than baseline."""
+    return [f"{label}: {values['seconds']:.6f}s vs baseline {expected['seconds']:.6f}s"
+            for label, values, expected in compared_metrics(results, baseline)
+            if expected.get('seconds') and values['seconds'] > expected['seconds'] * (1 + tolerance)]
+
+def print_table(results):
+    for size, metrics in results.items():
+        print(f"\n{size} projects (peak RSS {metrics.get('peak_rss_kb')} KB)")
+        for name, values in metrics.items():
+            if isinstance(values, dict):
+                syscalls = values.get('syscalls')
+                syscalls = f"{syscalls:.1f} calls" if syscalls is not None else ''
+                extra = ''.join(f"  {key}={value:.4g}" for key, value in values.items()
+                                if key not in ('seconds', 'syscalls') and value is not None)
+                print(f"  {name:<22}{values['seconds'] * 1000:>10.3f} ms{syscalls:>16}{extra}")
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", default="100,1000,10000")
+    parser.add_argument("--readme-kb", type=int, default=4)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--workdir", default=os.path.join(tempfile.gettempdir(), "menu_app_bench"),
+                        help="where synthetic roots are generated and reused")
+    parser.add_argument("--no-gui", action="store_true", help="skip the offscreen Qt load")
+    parser.add_argument("--tolerance", type=float, default=0.5,
+                        help="allowed slowdown against the baseline (0.5 = 50%%)")
+    parser.add_argument("--save-baseline", action="store_true",
+                        help="record the counts in baseline.json and the timings for this machine")
+    parser.add_argument("--output", help="also write the results as JSON")
+    parser.add_argument("--child", type=int, help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.child is not None:
+        json.dump(run_size(args.child, args), sys.stdout)
+        return 0
+
+    results = {}
+    for size in [int(size) for size in args.sizes.split(",")]:
+        command = [sys.executable, os.path.abspath(__file__), "--child", str(size),
+                   "--readme-kb", str(args.readme_kb), "--repeat", str(args.repeat),
+                   "--workdir", args.workdir]
+        if args.no_gui:
+            command.append("--no-gui")
+        output = subprocess.run(command, check=True, stdout=subprocess.PIPE, text=True).stdout
+        results[str(size)] = json.loads(output)
+    print_table(results)
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(results, f, indent=2)
+    if args.save_baseline:
+        with open(BASELINE_PATH, 'w') as f:
+            json.dump(portable_counts(results), f, indent=2)
+        with open(LOCAL_BASELINE_PATH, 'w') as f:
+            json.dump(results, f, indent=2)
+        print(f"\nBaselines saved to {BASELINE_PATH} and {LOCAL_BASELINE_PATH}")
+        return 0
+
+    regressions = []
+    if os.path.exists(BASELINE_PATH):
+        with open(BASELINE_PATH) as f:
+            regressions += compare_counts(results, json.load(f))
+    else:
+        print("\nNo count baseline to compare against (run with --save-baseline)")
+    if os.path.exists(LOCAL_BASELINE_PATH):
+        with open(LOCAL_BASELINE_PATH) as f:
+            regressions += compare_timings(results, json.load(f), args.tolerance)
+    else:
+        print("\nNo timing baseline for this machine, only counts were compared "
+              "(run with --save-baseline to record one)")
+    for regression in regressions:
+        print(f"REGRESSION {regression}")
+    if not regressions:
+        print("\nNo regressions against baseline")
+    return 1 if regressions else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
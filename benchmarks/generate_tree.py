@@ -0,0 +1,92 @@
+"""Generate synthetic project roots for the scan benchmarks."""
+import argparse
+import json
+import os
+import random
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from project_core import PROJECT_TYPE_MARKERS
+
+# Marker files for each project type recognised by detect_project_type
+FRAMEWORK_TEMPLATES = [
+    ("Node.js", ["package.json", "index.js"]),
+    ("Next.js", ["package.json", "next.config.js"]),
+    ("Angular", ["package.json", "angular.json"]),
+    ("Vue.js", ["package.json", "vue.config.js"]),
+    ("Python", ["requirements.txt", "main.py"]),
+    ("Django", ["requirements.txt", "manage.py"]),
+    ("Flask", ["requirements.txt", "flask_app.py"]),
+    ("Web", ["index.html", "style.css"]),
+]
+TYPE_TEMPLATES = FRAMEWORK_TEMPLATES + [(project_type, [marker])
+                                        for marker, icon, project_type in PROJECT_TYPE_MARKERS]
+
+# Folders that only pass is_valid_project through a well-known sub-directory
+DIRECTORY_ONLY_TEMPLATE = ("Project", [], ["src", "docs"])
+
+# Folders that are not projects at all
+NON_PROJECT_FILES = ["photo.png", "archive.zip", "notes"]
+
+FILLER = ("Lorem ipsum dolor sit amet, consectetur adipiscing elit, sed do eiusmod tempor "
+          "incididunt ut labore et dolore magna aliqua.\n")
+
+def file_content(name, index):
+    if name == "package.json":
+        return json.dumps({"name": f"project-{index}",
+                           "scripts": {"start": "node index.js", "dev": "node index.js"}})
+    if name.endswith(".py"):
+        return "print('hello')\n"
+    return ""
+
+def write_readme(project_path, index, readme_kb):
+    with open(os.path.join(project_path, "README.md"), 'w', encoding='utf-8') as f:
+        f.write(f"# Project {index}\n\nA **synthetic** project used by the [benchmarks](#). "
+                f"It exists to be scanned. Nothing else.\n\n")
+        remaining = readme_kb * 1024
+        while remaining > 0:
+            f.write(FILLER)
+            remaining -= len(FILLER)
+
+def generate_tree(root, projects, readme_kb=4, readme_ratio=0.8, non_project_ratio=0.1, seed=0):
+    """Create `projects` folders under root with a mix of project types and non-projects."""
+    rng = random.Random(seed)
+    os.makedirs(root, exist_ok=True)
+    for index in range(projects):
+        project_path = os.path.join(root, f"project-{index:05d}")
+        os.makedirs(project_path, exist_ok=True)
+
+        roll = rng.random()
+        if roll < non_project_ratio:
+            for name in NON_PROJECT_FILES:
+                open(os.path.join(project_path, name), 'w').close()
+            continue
+        if roll < non_project_ratio * 1.5:
+            _, files, dirs = DIRECTORY_ONLY_TEMPLATE
+        else:
+            _, files = rng.choice(TYPE_TEMPLATES)
+            dirs = []
+
+        for name in files:
+            with open(os.path.join(project_path, name), 'w') as f:
+                f.write(file_content(name, index))
+        for name in dirs:
+            os.makedirs(os.path.join(project_path, name), exist_ok=True)
+        if rng.random() < readme_ratio:
+            write_readme(project_path, index, readme_kb)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Generate a synthetic projects root.")
+    parser.add_argument("root")
+    parser.add_argument("--projects", type=int, default=100)
+    parser.add_argument("--readme-kb", type=int, default=4, help="filler size of each README")
+    parser.add_argument("--readme-ratio", type=float, default=0.8)
+    parser.add_argument("--non-project-ratio", type=float, default=0.1)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+    generate_tree(args.root, args.projects, args.readme_kb, args.readme_ratio,
+                  args.non_project_ratio, args.seed)
+
+if __name__ == "__main__":
+    main()
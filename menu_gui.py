@@ -0,0 +1,1786 @@
+import sys
+import os
+import json
+import threading
+import time
+from PyQt6.QtWidgets import (QApplication, QMainWindow, QWidget, QVBoxLayout,
+                            QListWidget, QLabel, QDialog,
+                            QPushButton, QHBoxLayout, QMessageBox, QComboBox,
+                            QFrame, QFileDialog,
+                            QLineEdit, QFormLayout, QProgressBar,
+                            QListView, QStyledItemDelegate, QStyle, QAbstractItemView,
+                            QPlainTextEdit, QSpinBox)
+from PyQt6.QtCore import (Qt, QUrl, QSize, QSettings, QTimer, QObject, QThread,
+                          QRunnable, QThreadPool, pyqtSignal, QAbstractListModel,
+                          QModelIndex, QPersistentModelIndex, QRect, QRectF, QPointF, QEvent,
+                          QFileSystemWatcher)
+from PyQt6.QtGui import (QDesktopServices, QFont, QAction, QActionGroup,
+                         QColor, QPainter, QPalette, QPixmap, QFontMetrics)
+from project_core import (DEFAULT_PROJECTS_DIRECTORY, DEFAULT_SCAN_DEPTH, OUTPUT_LINES,
+                          ActivityTracker, EnvironmentResolver, GitStatusCache, IndexClient,
+                          IndexDaemonError, ProbeTimeout, ProcessRegistry,
+                          ProjectDiscovery, ProjectIndex, ProjectSearchIndex, ReadmeCache,
+                          call_with_timeout, default_index_path, default_snapshot_path, file_mtime,
+                          launch_command, list_project_dirs, load_grid_snapshot, parse_roots,
+                          profiler, read_readme_info, root_of, run_install, save_grid_snapshot,
+                          activity_sort_key)
+
+# One stylesheet for the whole application, parsed once; widgets pick their look with
+# the "role" dynamic property instead of carrying their own stylesheet
+APP_STYLESHEET = """
+    QLabel[role="title"] {
+        font-size: 24px;
+        font-weight: bold;
+        margin: 10px;
+    }
+    QLabel[role="heading"] {
+        font-size: 14px;
+        font-weight: bold;
+    }
+    QLabel[role="error"] {
+        color: red;
+    }
+    ProjectTooltip {
+        background-color: #ffffff;
+        border: 1px solid #cccccc;
+        border-radius: 4px;
+        padding: 8px;
+    }
+    ProjectTooltip QLabel {
+        font-size: 11px;
+    }
+"""
+
+def apply_app_stylesheet():
+    app = QApplication.instance()
+    if app.styleSheet() != APP_STYLESHEET:
+        app.setStyleSheet(APP_STYLESHEET)
+
+class NodeLaunchDialog(QDialog):
+    def __init__(self, record, environment=None, parent=None):
+        super().__init__(parent)
+        self.setWindowTitle("Launch Node.js Project")
+        self.setGeometry(200, 200, 500, 250)
+        self.record = record
+        self.project_path = record.path
+        self.environment = environment
+        
+        layout = QVBoxLayout(self)
+        
+        # package.json info comes from the scan record
+        self.project_name = record.package_name or "Unknown Project"
+        self.project_url = record.homepage or ""
+        self.scripts = record.scripts or {}
+        
+        # Add project info
+        info_label = QLabel(f"Project: {self.project_name}")
+        info_label.setProperty("role", "heading")
+        layout.addWidget(info_label)
+        
+        if self.project_url:
+            url_label = QLabel(f"URL: {self.project_url}")
+            layout.addWidget(url_label)
+        
+        # Add script selection
+        if self.scripts:
+            script_layout = QHBoxLayout()
+            script_label = QLabel("Select script to run:")
+            script_layout.addWidget(script_label)
+            
+            self.script_combo = QComboBox()
+            for script_name in self.scripts.keys():
+                self.script_combo.addItem(script_name)
+            script_layout.addWidget(self.script_combo)
+            layout.addLayout(script_layout)
+        else:
+            no_scripts_label = QLabel("No npm scripts found in package.json")
+            no_scripts_label.setProperty("role", "error")
+            layout.addWidget(no_scripts_label)
+        
+        # Dependencies found missing or stale by the readiness pass
+        not_ready = environment is not None and environment.ready is False
+        if not_ready:
+            install_label = QLabel(f"{environment.detail}; run {environment.install_text()} first")
+            install_label.setProperty("role", "error")
+            layout.addWidget(install_label)
+        
+        # Add buttons
+        button_layout = QHBoxLayout()
+        
+        if self.project_url:
+            open_url_btn = QPushButton("Open URL")
+            open_url_btn.clicked.connect(lambda: QDesktopServices.openUrl(QUrl(self.project_url)))
+            button_layout.addWidget(open_url_btn)
+        
+        if not_ready:
+            install_btn = QPushButton("Install")
+            install_btn.clicked.connect(self.install_dependencies)
+            button_layout.addWidget(install_btn)
+        
+        if self.scripts:
+            launch_btn = QPushButton("Run Script")
+            launch_btn.clicked.connect(self.launch_project)
+            button_layout.addWidget(launch_btn)
+        
+        cancel_btn = QPushButton("Cancel")
+        cancel_btn.clicked.connect(self.reject)
+        button_layout.addWidget(cancel_btn)
+        
+        layout.addLayout(button_layout)
+    
+    def launch_project(self):
+        if not self.scripts:
+            QMessageBox.warning(self, "Error", "No npm scripts available to run")
+            return
+            
+        selected_script = self.script_combo.currentText()
+        try:
+            self.parent().start_project(self.record, launch_command(self.record, selected_script))
+            self.accept()
+        except Exception as e:
+            QMessageBox.critical(self, "Error", f"Failed to run npm script: {str(e)}")
+    
+    def install_dependencies(self):
+        # Runs like a launch, so its output shows and the project cannot start meanwhile
+        try:
+            self.parent().start_project(self.record, self.environment.install_command(),
+                                        count_launch=False)
+            self.accept()
+        except OSError as e:
+            QMessageBox.critical(self, "Error", f"Failed to install dependencies: {str(e)}")
+
+class ProcessOutputDialog(QDialog):
+    """Live output of a launched project, with stop and restart actions."""
+    REFRESH_INTERVAL = 200  # ms
+    
+    def __init__(self, record, processes, parent=None):
+        super().__init__(parent)
+        self.setWindowTitle(f"{record.name} - Output")
+        self.setGeometry(250, 250, 700, 450)
+        self.project_path = record.path
+        self.processes = processes
+        self.process = None
+        self.seen = 0
+        
+        layout = QVBoxLayout(self)
+        
+        self.status_label = QLabel()
+        layout.addWidget(self.status_label)
+        
+        # Output view, bounded like the process's own buffer
+        self.output_text = QPlainTextEdit()
+        self.output_text.setReadOnly(True)
+        self.output_text.setLineWrapMode(QPlainTextEdit.LineWrapMode.NoWrap)
+        self.output_text.setMaximumBlockCount(OUTPUT_LINES)
+        self.output_text.setFont(QFont("monospace"))
+        layout.addWidget(self.output_text)
+        
+        # Buttons
+        button_layout = QHBoxLayout()
+        self.stop_btn = QPushButton("Stop")
+        self.stop_btn.clicked.connect(lambda: self.processes.stop(self.project_path))
+        button_layout.addWidget(self.stop_btn)
+        
+        restart_btn = QPushButton("Restart")
+        restart_btn.clicked.connect(lambda: self.attach(self.processes.restart(self.project_path)))
+        button_layout.addWidget(restart_btn)
+        
+        close_btn = QPushButton("Close")
+        close_btn.clicked.connect(self.hide)
+        button_layout.addWidget(close_btn)
+        layout.addLayout(button_layout)
+        
+        # Output is polled only while the dialog is visible
+        self.refresh_timer = QTimer(self)
+        self.refresh_timer.setInterval(self.REFRESH_INTERVAL)
+        self.refresh_timer.timeout.connect(self.refresh_output)
+        self.attach(processes.get(self.project_path))
+    
+    def attach(self, process):
+        self.process = process
+        self.seen = 0
+        self.output_text.clear()
+        self.refresh_output()
+    
+    def refresh_output(self):
+        total, lines = self.process.lines(self.seen)
+        if total - self.seen > len(lines):
+            lines.insert(0, ('', f"... {total - self.seen - len(lines)} earlier lines dropped ..."))
+        if lines:
+            self.output_text.appendPlainText("\n".join(line for name, line in lines))
+        self.seen = total
+        
+        if self.process.running:
+            self.status_label.setText(f"Running: {' '.join(self.process.command)}")
+        elif self.process.starting:
+            self.status_label.setText("Starting...")
+        elif self.process.popen is None:
+            self.status_label.setText("Stopped")
+        else:
+            self.status_label.setText(f"Exited with code {self.process.returncode}")
+        self.stop_btn.setEnabled(self.process.busy)
+    
+    def showEvent(self, event):
+        self.refresh_timer.start()
+        super().showEvent(event)
+    
+    def hideEvent(self, event):
+        self.refresh_timer.stop()
+        super().hideEvent(event)
+
+class ProjectTooltip(QFrame):
+    def __init__(self, parent=None):
+        super().__init__(parent, Qt.WindowType.ToolTip)
+        self.setFrameStyle(QFrame.Shape.Box | QFrame.Shadow.Plain)
+        
+        # Create layout
+        layout = QVBoxLayout(self)
+        layout.setContentsMargins(8, 8, 8, 8)
+        
+        # Description label
+        self.desc_label = QLabel()
+        self.desc_label.setWordWrap(True)
+        self.desc_label.setMaximumWidth(300)  # Limit width for better readability
+        layout.addWidget(self.desc_label)
+        
+        # Hide initially
+        self.hide()
+    
+    def show_tooltip(self, text, pos):
+        self.desc_label.setText(text.get('description', ''))
+        self.adjustSize()
+        
+        # Position the tooltip
+        screen = QApplication.primaryScreen().geometry()
+        tooltip_size = self.sizeHint()
+        
+        # Calculate position to ensure tooltip stays on screen
+        x = pos.x() + 20
+        y = pos.y() + 20
+        
+        if x + tooltip_size.width() > screen.right():
+            x = pos.x() - tooltip_size.width() - 20
+        if y + tooltip_size.height() > screen.bottom():
+            y = pos.y() - tooltip_size.height() - 20
+        
+        self.move(x, y)
+        self.show()
+
+class ScanSignals(QObject):
+    # Every signal carries the generation of the load that started the worker,
+    # so results arriving after a newer load are dropped. Lists are sent as plain
+    # Python objects: a list signature would convert every record to a QVariantMap.
+    batch_ready = pyqtSignal(int, object)
+    removed = pyqtSignal(int, object)
+    progress = pyqtSignal(int, int, int)
+    finished = pyqtSignal(int)
+    root_ready = pyqtSignal(int, str)
+    degraded = pyqtSignal(int, str, str)  # generation, root, reason
+    described = pyqtSignal(int, object)  # generation, [(path, title, description)]
+    probed = pyqtSignal(int, object)  # generation, [(path, probe result or None)]
+    installed = pyqtSignal(int, str, bool)  # generation, project path, succeeded
+    served = pyqtSignal(int)  # an index daemon answered; it does the scanning and watching
+    daemon_lost = pyqtSignal(int, bool)  # generation, whether the daemon is worth reconnecting to
+
+class ProjectScanWorker(QRunnable):
+    """Discover projects under every root on a thread pool and stream records back in batches."""
+    MAX_WORKERS = 8
+    BATCH_SIZE = 16
+    BATCH_INTERVAL = 0.05  # seconds
+
+    def __init__(self, roots, index, max_depth=DEFAULT_SCAN_DEPTH, generation=0):
+        super().__init__()
+        self.roots = roots
+        self.index = index
+        self.max_depth = max_depth
+        self.generation = generation
+        self.signals = ScanSignals()
+        self.cancelled = threading.Event()
+
+    def cancel(self):
+        self.cancelled.set()
+
+    def run(self):
+        with profiler.phase("scan"):
+            self.scan()
+        self.signals.finished.emit(self.generation)
+
+    def scan(self):
+        # Roots are walked together, so the scan costs about as much as the slowest root
+        discovery = ProjectDiscovery([(root, 0) for root in self.roots], self.index,
+                                     self.max_depth, self.MAX_WORKERS, self.cancelled)
+        self.signals.progress.emit(self.generation, 0, 0)
+        # Flush often enough that the first cards paint right away, even while a root stalls;
+        # invalid folders are reported too so they can be watched
+        for batch in discovery.batches(self.BATCH_SIZE, self.BATCH_INTERVAL):
+            # Other windows, the CLI and the daemon share the index: commit per batch
+            self.index.commit()
+            self.signals.batch_ready.emit(self.generation, batch)
+            self.signals.progress.emit(self.generation, discovery.done,
+                                       discovery.done + discovery.pending)
+        if self.cancelled.is_set():
+            return
+
+        self.signals.progress.emit(self.generation, discovery.done, discovery.done)
+        # Unreachable roots keep their cached entries; their cards come from the index
+        for root, reason in discovery.failed_roots.items():
+            self.signals.degraded.emit(self.generation, root, reason)
+        for root in discovery.listed_roots:
+            if root not in discovery.failed_roots:
+                stale = self.index.prune(root, discovery.seen_paths)
+                if stale:
+                    self.signals.removed.emit(self.generation, stale)
+                self.signals.root_ready.emit(self.generation, root)
+        self.index.commit()
+
+class DaemonScanWorker(ProjectScanWorker):
+    """Take the projects from a running index daemon, or scan them here if none is running.
+
+    A served load arrives as one snapshot (then finished is emitted, as after a scan)
+    followed by change events for as long as the worker is not cancelled.
+    """
+
+    def __init__(self, roots, index, max_depth=DEFAULT_SCAN_DEPTH, generation=0):
+        super().__init__(roots, index, max_depth, generation)
+        self.client = None
+
+    def cancel(self):
+        super().cancel()
+        client = self.client
+        if client is not None:
+            client.close()  # wakes the thread blocked reading events
+
+    def run(self):
+        client = IndexClient.connect()
+        if client is None:
+            return super().run()
+        self.client = client
+        if self.cancelled.is_set():
+            return client.close()
+        self.signals.served.emit(self.generation)
+        # Only a daemon that served a snapshot and then went away is tried again
+        usable = False
+        try:
+            # Snapshot straight away, then whatever a fresh rescan finds
+            client.send('subscribe', self.roots, self.max_depth, rescan=True)
+            for event, payload in client.events():
+                if self.cancelled.is_set():
+                    break
+                if event == 'snapshot':
+                    usable = True
+                    self.signals.batch_ready.emit(self.generation, payload)
+                    self.signals.finished.emit(self.generation)
+                elif event == 'changed':
+                    self.signals.batch_ready.emit(self.generation, payload)
+                elif event == 'removed':
+                    self.signals.removed.emit(self.generation, payload)
+        except IndexDaemonError as e:
+            usable = False
+            if not self.cancelled.is_set():
+                print(f"Error reading from the index daemon: {e}")
+        except (OSError, ValueError) as e:
+            if not self.cancelled.is_set():
+                print(f"Error reading from the index daemon: {e}")
+        finally:
+            client.close()
+        if not self.cancelled.is_set():
+            self.signals.daemon_lost.emit(self.generation, usable)
+
+class ProjectRefreshWorker(QRunnable):
+    """Re-scan only the folders touched by filesystem events."""
+
+    def __init__(self, roots, changed_paths, known_dirs, index, max_depth=DEFAULT_SCAN_DEPTH,
+                 generation=0):
+        super().__init__()
+        self.roots = roots
+        self.changed_paths = changed_paths
+        self.known_dirs = known_dirs  # folder path -> depth below its root
+        self.index = index
+        self.max_depth = max_depth
+        self.generation = generation
+        self.signals = ScanSignals()
+        self.cancelled = threading.Event()
+
+    def cancel(self):
+        self.cancelled.set()
+
+    def descendants(self, path):
+        prefix = os.path.join(path, "")
+        return {known for known in self.known_dirs if known.startswith(prefix)}
+
+    def run(self):
+        starts = {}
+        removed = set()
+        for path in self.changed_paths:
+            if path in self.roots:
+                # A root changed: diff its listing against the folders already known
+                try:
+                    listed = set(call_with_timeout(list_project_dirs, path))
+                except OSError as e:
+                    print(f"Error scanning {path}: {e}")
+                    continue
+                children = {known for known, depth in self.known_dirs.items()
+                            if depth == 1 and os.path.dirname(known) == path}
+                starts.update((child, 1) for child in listed - children)
+                removed |= children - listed
+            elif path in self.known_dirs:
+                try:
+                    exists = call_with_timeout(os.path.isdir, path)
+                except ProbeTimeout as e:
+                    print(f"Error scanning {path}: {e}")
+                    continue
+                if exists:
+                    starts[path] = self.known_dirs[path]
+                else:
+                    removed.add(path)
+        for path in list(removed):
+            removed |= self.descendants(path)
+
+        # Re-walk each changed folder; known sub-folders not found again have gone
+        starts = [(path, depth) for path, depth in starts.items() if path not in removed]
+        discovery = ProjectDiscovery(starts, self.index, self.max_depth, cancelled=self.cancelled)
+        records = list(discovery)
+        if self.cancelled.is_set():
+            # A partial walk cannot tell which folders have gone
+            self.signals.finished.emit(self.generation)
+            return
+        for path, depth in starts:
+            removed |= self.descendants(path) - discovery.seen_paths
+
+        self.index.remove(removed)
+        self.index.commit()
+        if records:
+            self.signals.batch_ready.emit(self.generation, records)
+        if removed:
+            self.signals.removed.emit(self.generation, sorted(removed))
+        self.signals.finished.emit(self.generation)
+
+class ReadmePrefetchWorker(QRunnable):
+    """Parse READMEs at low priority after a scan so search covers titles and descriptions.
+
+    Also parses the README of a hovered card, through the window's ReadmeCache.
+    """
+    BATCH_INTERVAL = 0.2  # seconds
+
+    def __init__(self, projects, index, generation=0, cache=None):
+        super().__init__()
+        self.projects = projects  # (path, name, readme_path, readme_mtime) tuples
+        self.index = index
+        self.generation = generation
+        self.cache = cache
+        self.signals = ScanSignals()
+        self.cancelled = threading.Event()
+
+    def cancel(self):
+        self.cancelled.set()
+
+    def run(self):
+        batch = []
+        last_emit = time.monotonic()
+        for path, name, readme_path, readme_mtime in self.projects:
+            if self.cancelled.is_set():
+                break
+            if self.cache is not None:
+                info, mtime = self.cache.get(readme_path, name)
+            else:
+                mtime = file_mtime(readme_path)
+                with profiler.project(path), profiler.phase("readme"):
+                    info = read_readme_info(readme_path, name)
+            if mtime == readme_mtime:
+                self.index.set_readme_info(path, info['title'], info['description'])
+                self.index.commit()
+            batch.append((path, info['title'], info['description']))
+
+            now = time.monotonic()
+            if now - last_emit >= self.BATCH_INTERVAL:
+                self.signals.described.emit(self.generation, batch)
+                batch = []
+                last_emit = now
+        self.index.commit()
+        if self.cancelled.is_set():
+            return
+        if batch:
+            self.signals.described.emit(self.generation, batch)
+        self.signals.finished.emit(self.generation)
+
+class ProjectProbeWorker(QRunnable):
+    """Run a per-project probe (git status, environment) over records one after another."""
+    BATCH_INTERVAL = 0.2  # seconds
+
+    def __init__(self, records, probe, generation=0, index=None):
+        super().__init__()
+        self.records = records
+        self.probe = probe
+        self.generation = generation
+        self.index = index  # committed after each project if the probe writes to it
+        self.signals = ScanSignals()
+        self.cancelled = threading.Event()
+
+    def cancel(self):
+        self.cancelled.set()
+
+    def run(self):
+        batch = []
+        last_emit = time.monotonic()
+        for record in self.records:
+            if self.cancelled.is_set():
+                break
+            try:
+                batch.append((record.path, self.probe(record)))
+            except Exception as e:
+                print(f"Error probing {record.path}: {e}")
+            if self.index is not None:
+                # The next probe may take seconds; never hold the write lock through it
+                self.index.commit()
+
+            now = time.monotonic()
+            if batch and now - last_emit >= self.BATCH_INTERVAL:
+                self.signals.probed.emit(self.generation, batch)
+                batch = []
+                last_emit = now
+        if self.cancelled.is_set():
+            return
+        if batch:
+            self.signals.probed.emit(self.generation, batch)
+        self.signals.finished.emit(self.generation)
+
+class InstallWorker(QRunnable):
+    """Install a project's dependencies ahead of its first launch."""
+
+    def __init__(self, project_path, environment, generation=0):
+        super().__init__()
+        self.project_path = project_path
+        self.environment = environment
+        self.generation = generation
+        self.signals = ScanSignals()
+        self.cancelled = threading.Event()
+
+    def cancel(self):
+        self.cancelled.set()
+
+    def run(self):
+        if self.cancelled.is_set():
+            return
+        succeeded = run_install(self.environment, self.project_path, self.cancelled)
+        if self.cancelled.is_set():
+            return
+        self.signals.installed.emit(self.generation, self.project_path, succeeded)
+        self.signals.finished.emit(self.generation)
+
+class ProjectListModel(QAbstractListModel):
+    """List model holding one scan record per project card.
+
+    While a search is active only the matching records are exposed, in ranked order;
+    otherwise they are kept in sort_key order, if one is set.
+    """
+    RESORT_DELAY = 200  # ms; cards streaming in are appended and sorted once per interval
+    PathRole = Qt.ItemDataRole.UserRole + 1
+    TypeRole = Qt.ItemDataRole.UserRole + 2
+    IconRole = Qt.ItemDataRole.UserRole + 3
+    DescriptionRole = Qt.ItemDataRole.UserRole + 4
+    GitRole = Qt.ItemDataRole.UserRole + 5
+    ReadinessRole = Qt.ItemDataRole.UserRole + 6
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.records = []  # shown records, in display order
+        self.rows = {}  # project path -> row
+        self.all_records = {}  # project path -> record, for every valid project
+        self.git_status = {}  # project path -> GitStatus, for git repositories
+        self.readiness = {}  # project path -> ProjectEnvironment, for launchable projects
+        self.activity = {}  # project path -> ActivityStats
+        self.sort_mode = 'name'
+        self.sort_key = None
+        self.resort_timer = QTimer(self)
+        self.resort_timer.setSingleShot(True)
+        self.resort_timer.setInterval(self.RESORT_DELAY)
+        self.resort_timer.timeout.connect(self.resort)
+        self.filtered = False
+
+    def rowCount(self, parent=QModelIndex()):
+        if parent.isValid():
+            return 0
+        return len(self.records)
+
+    def record(self, index):
+        return self.records[index.row()]
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid():
+            return None
+        record = self.records[index.row()]
+        if role == Qt.ItemDataRole.DisplayRole:
+            return record.name
+        if role == self.PathRole:
+            return record.path
+        if role == self.TypeRole:
+            return record.type
+        if role == self.IconRole:
+            return record.icon
+        if role == self.DescriptionRole:
+            return record.description
+        if role == self.GitRole:
+            return self.git_status.get(record.path)
+        if role == self.ReadinessRole:
+            return self.readiness.get(record.path)
+        return None
+
+    def clear(self):
+        self.beginResetModel()
+        self.records = []
+        self.rows = {}
+        self.all_records = {}
+        self.git_status = {}
+        self.readiness = {}
+        self.activity.clear()  # the sort key holds on to this dict
+        self.endResetModel()
+
+    def set_git_status(self, items):
+        self.set_probed(self.git_status, self.GitRole, items)
+
+    def set_readiness(self, items):
+        self.set_probed(self.readiness, self.ReadinessRole, items)
+
+    def set_sort_mode(self, mode):
+        self.sort_mode = mode
+        self.sort_key = activity_sort_key(mode, self.activity)
+        self.resort()
+
+    def load_activity(self, activity):
+        """Replace every project's ActivityStats, e.g. with the ones stored in the index."""
+        self.activity.clear()
+        self.activity.update(activity)
+        self.resort()
+
+    def set_activity(self, items):
+        """Store (path, ActivityStats) pairs and move the cards whose order they change."""
+        for path, stats in items:
+            if path in self.all_records and stats is not None:
+                self.activity[path] = stats
+        if self.sort_key is not None and not self.resort_timer.isActive():
+            self.resort_timer.start()
+
+    def resort(self):
+        """Re-sort the shown records in place, keeping the views' persistent indexes."""
+        self.resort_timer.stop()
+        if self.sort_key is None or self.filtered:
+            return
+        records = sorted(self.records, key=self.sort_key)
+        if all(new is old for new, old in zip(records, self.records)):
+            return
+        self.layoutAboutToBeChanged.emit()
+        moved = self.persistentIndexList()
+        paths = [self.records[index.row()].path for index in moved]
+        self.records = records
+        self.rows = {record.path: row for row, record in enumerate(self.records)}
+        self.changePersistentIndexList(moved, [self.index(self.rows[path]) for path in paths])
+        self.layoutChanged.emit()
+
+
+    def set_probed(self, values, role, items):
+        """Store (path, result or None) pairs and repaint the shown cards they belong to."""
+        for path, value in items:
+            if path not in self.all_records:
+                continue
+            if value is None:
+                values.pop(path, None)
+            else:
+                values[path] = value
+            row = self.rows.get(path)
+            if row is not None:
+                index = self.index(row)
+                self.dataChanged.emit(index, index, [role])
+
+    def set_filter(self, paths):
+        """Show only paths, in that order, or every project when paths is None."""
+        if paths is not None:
+            records = [self.all_records[path] for path in paths if path in self.all_records]
+        elif self.sort_key is not None:
+            records = sorted(self.all_records.values(), key=self.sort_key)
+        else:
+            records = list(self.all_records.values())
+        if records == self.records and self.filtered == (paths is not None):
+            return  # keep the scroll position when nothing changed
+        self.beginResetModel()
+        self.filtered = paths is not None
+        self.records = records
+        self.rows = {record.path: row for row, record in enumerate(self.records)}
+        self.endResetModel()
+
+    def upsert_records(self, records):
+        """Add new valid projects, update changed ones in place and drop ones no longer valid.
+
+        While filtered, new projects are only remembered; the next set_filter() places them.
+        Rows whose record is unchanged are not repainted, and README text already known for
+        an unchanged README is kept.
+        """
+        added = []
+        gone = []
+        for record in records:
+            row = self.rows.get(record.path)
+            if not record.is_valid:
+                self.all_records.pop(record.path, None)
+                if row is not None:
+                    gone.append(record.path)
+                continue
+            old = self.all_records.get(record.path)
+            if (old is not None and record.description is None
+                    and old.readme_path == record.readme_path
+                    and old.readme_mtime == record.readme_mtime):
+                record.title = old.title
+                record.description = old.description
+            self.all_records[record.path] = record
+            if row is None:
+                if not self.filtered:
+                    added.append(record)
+            else:
+                changed = self.records[row] != record
+                self.records[row] = record
+                if changed:
+                    index = self.index(row)
+                    self.dataChanged.emit(index, index)
+        if gone:
+            self.remove_paths(gone)
+        if added:
+            first = len(self.records)
+            self.beginInsertRows(QModelIndex(), first, first + len(added) - 1)
+            for record in added:
+                self.rows[record.path] = len(self.records)
+                self.records.append(record)
+            self.endInsertRows()
+            if first == 0:
+                self.resort()  # the first cards are painted in order
+            elif self.sort_key is not None and not self.resort_timer.isActive():
+                self.resort_timer.start()
+
+    def remove_paths(self, paths):
+        for path in paths:
+            self.all_records.pop(path, None)
+            self.git_status.pop(path, None)
+            self.readiness.pop(path, None)
+            self.activity.pop(path, None)
+        # Remove from the bottom up so earlier row numbers stay valid
+        for row in sorted((self.rows[path] for path in paths if path in self.rows), reverse=True):
+            self.beginRemoveRows(QModelIndex(), row, row)
+            del self.records[row]
+            self.endRemoveRows()
+        self.rows = {record.path: row for row, record in enumerate(self.records)}
+
+class IconPixmapCache:
+    """Type icons rendered to pixmaps once per color and device pixel ratio.
+
+    Shaping an emoji glyph costs far more than blitting a pixmap, and every card of a
+    type shows the same icon, so the cache only holds a few entries per project type.
+    """
+
+    def __init__(self, pixel_size=24):
+        self.font = QFont()
+        self.font.setPixelSize(pixel_size)
+        self.metrics = QFontMetrics(self.font)
+        self.pixmaps = {}  # (icon, rgba, ratio) -> QPixmap
+
+    def get(self, icon, color, ratio):
+        key = (icon, color.rgba(), ratio)
+        pixmap = self.pixmaps.get(key)
+        if pixmap is None:
+            pixmap = self.pixmaps[key] = self.render(icon, color, ratio)
+        return pixmap
+
+    def render(self, icon, color, ratio):
+        width = max(self.metrics.horizontalAdvance(icon), 1)
+        height = self.metrics.height()
+        pixmap = QPixmap(round(width * ratio), round(height * ratio))
+        pixmap.setDevicePixelRatio(ratio)
+        pixmap.fill(Qt.GlobalColor.transparent)
+        painter = QPainter(pixmap)
+        painter.setFont(self.font)
+        painter.setPen(color)
+        painter.drawText(QRect(0, 0, width, height), Qt.AlignmentFlag.AlignCenter, icon)
+        painter.end()
+        return pixmap
+
+class ProjectCardDelegate(QStyledItemDelegate):
+    """Paints each project as a card; only rows inside the viewport are ever painted."""
+    CARD_SIZE = QSize(140, 120)
+    GIT_HEIGHT = 14
+    # (normal, hovered) backgrounds of even and odd rows
+    BACKGROUNDS = ((QColor("#f0f0f0"), QColor("#e0e0e0")),
+                   (QColor("#ffffff"), QColor("#f5f5f5")))
+    BORDER_COLOR = QColor("#cccccc")
+    TYPE_COLOR = QColor("#666666")
+    GIT_CLEAN_COLOR = QColor("#2e7d32")
+    GIT_DIRTY_COLOR = QColor("#e65100")
+    # Dependency readiness dot in the top right corner: installed, missing or stale
+    READY_COLORS = {True: QColor("#2e7d32"), False: QColor("#e65100")}
+    icons = None  # IconPixmapCache shared by every delegate
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.name_font = QFont()
+        self.name_font.setPixelSize(12)
+        self.name_font.setBold(True)
+        self.type_font = QFont()
+        self.type_font.setPixelSize(10)
+        if ProjectCardDelegate.icons is None:
+            ProjectCardDelegate.icons = IconPixmapCache(24)
+
+    def sizeHint(self, option, index):
+        return self.CARD_SIZE
+
+    def paint(self, painter, option, index):
+        painter.save()
+        painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+        
+        # Alternating background colors with a darker shade on hover
+        hovered = bool(option.state & QStyle.StateFlag.State_MouseOver)
+        background = self.BACKGROUNDS[index.row() % 2][hovered]
+        card_rect = QRectF(option.rect).adjusted(0.5, 0.5, -0.5, -0.5)
+        painter.setPen(self.BORDER_COLOR)
+        painter.setBrush(background)
+        painter.drawRoundedRect(card_rect, 8, 8)
+        
+        environment = index.data(ProjectListModel.ReadinessRole)
+        if environment is not None and environment.ready is not None:
+            painter.setPen(Qt.PenStyle.NoPen)
+            painter.setBrush(self.READY_COLORS[environment.ready])
+            painter.drawEllipse(QPointF(card_rect.right() - 8, card_rect.top() + 8), 3.5, 3.5)
+        
+        content = option.rect.adjusted(8, 8, -8, -8)
+        text_color = option.palette.color(QPalette.ColorRole.Text)
+        
+        # Project name
+        name_rect = QRect(content.left(), content.top(), content.width(), 32)
+        painter.setFont(self.name_font)
+        painter.setPen(text_color)
+        painter.drawText(name_rect, Qt.AlignmentFlag.AlignCenter | Qt.TextFlag.TextWordWrap,
+                         index.data(Qt.ItemDataRole.DisplayRole))
+        
+        # Project type
+        type_rect = QRect(content.left(), name_rect.bottom() + 1, content.width(), 14)
+        painter.setFont(self.type_font)
+        painter.setPen(self.TYPE_COLOR)
+        painter.drawText(type_rect, Qt.AlignmentFlag.AlignCenter,
+                         index.data(ProjectListModel.TypeRole))
+        
+        # Git branch and state along the bottom, once the background pass has read it
+        git_rect = QRect(content.left(), content.bottom() - self.GIT_HEIGHT + 1, content.width(),
+                         self.GIT_HEIGHT)
+        git_status = index.data(ProjectListModel.GitRole)
+        if git_status is not None:
+            painter.setPen(self.GIT_DIRTY_COLOR if git_status.dirty else self.GIT_CLEAN_COLOR)
+            painter.drawText(git_rect, Qt.AlignmentFlag.AlignCenter,
+                             painter.fontMetrics().elidedText(git_status.summary(),
+                                                              Qt.TextElideMode.ElideMiddle,
+                                                              git_rect.width()))
+        
+        # Project type icon, blitted from the shared cache
+        icon_rect = QRect(content.left(), type_rect.bottom() + 3, content.width(),
+                          git_rect.top() - type_rect.bottom() - 4)
+        icon = index.data(ProjectListModel.IconRole)
+        if icon:
+            pixmap = self.icons.get(icon, text_color, painter.device().devicePixelRatioF())
+            size = pixmap.deviceIndependentSize()
+            center = QRectF(icon_rect).center()
+            painter.drawPixmap(QPointF(center.x() - size.width() / 2,
+                                       center.y() - size.height() / 2), pixmap)
+        painter.restore()
+
+class PerformanceDialog(QDialog):
+    """Shows the scan cost report collected by the profiler."""
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.setWindowTitle("Scan Performance")
+        self.setGeometry(200, 200, 600, 500)
+        
+        layout = QVBoxLayout(self)
+        
+        if not profiler.enabled:
+            hint_label = QLabel("Profiling is off. Enable File > Profile Scans and reload to collect costs.")
+            hint_label.setWordWrap(True)
+            layout.addWidget(hint_label)
+        
+        # Report as formatted JSON
+        self.report_text = QPlainTextEdit()
+        self.report_text.setReadOnly(True)
+        self.report_text.setLineWrapMode(QPlainTextEdit.LineWrapMode.NoWrap)
+        layout.addWidget(self.report_text)
+        self.refresh_report()
+        
+        # Buttons
+        button_layout = QHBoxLayout()
+        export_btn = QPushButton("Export JSON...")
+        export_btn.clicked.connect(self.export_report)
+        button_layout.addWidget(export_btn)
+        
+        refresh_btn = QPushButton("Refresh")
+        refresh_btn.clicked.connect(self.refresh_report)
+        button_layout.addWidget(refresh_btn)
+        
+        close_btn = QPushButton("Close")
+        close_btn.clicked.connect(self.accept)
+        button_layout.addWidget(close_btn)
+        layout.addLayout(button_layout)
+    
+    def refresh_report(self):
+        self.report = profiler.report()
+        self.report_text.setPlainText(json.dumps(self.report, indent=2))
+    
+    def export_report(self):
+        file_path, _ = QFileDialog.getSaveFileName(self, "Export Scan Report", "scan_report.json",
+                                                   "JSON files (*.json)")
+        if not file_path:
+            return
+        try:
+            with open(file_path, 'w') as f:
+                json.dump(self.report, f, indent=2)
+        except OSError as e:
+            QMessageBox.critical(self, "Error", f"Could not write report: {str(e)}")
+
+class SettingsDialog(QDialog):
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.setWindowTitle("Settings")
+        self.setGeometry(200, 200, 500, 300)
+        
+        # Create layout
+        layout = QFormLayout(self)
+        
+        # Projects directories list
+        self.dir_list = QListWidget()
+        self.dir_list.addItems(parse_roots(
+            parent.settings.value("projects_directory", DEFAULT_PROJECTS_DIRECTORY)))
+        
+        # Add and remove buttons
+        add_btn = QPushButton("Add...")
+        add_btn.clicked.connect(self.browse_directory)
+        remove_btn = QPushButton("Remove")
+        remove_btn.clicked.connect(self.remove_directory)
+        
+        # Create layout for the list and its buttons
+        dir_buttons = QVBoxLayout()
+        dir_buttons.addWidget(add_btn)
+        dir_buttons.addWidget(remove_btn)
+        dir_buttons.addStretch()
+        dir_layout = QHBoxLayout()
+        dir_layout.addWidget(self.dir_list)
+        dir_layout.addLayout(dir_buttons)
+        
+        layout.addRow("Projects Directories:", dir_layout)
+        
+        # How many folder levels to search for nested projects
+        self.depth_input = QSpinBox()
+        self.depth_input.setRange(1, 10)
+        self.depth_input.setValue(int(parent.settings.value("scan_depth", DEFAULT_SCAN_DEPTH)))
+        layout.addRow("Search Depth:", self.depth_input)
+        
+        # Buttons
+        button_layout = QHBoxLayout()
+        save_btn = QPushButton("Save")
+        save_btn.clicked.connect(self.save_settings)
+        cancel_btn = QPushButton("Cancel")
+        cancel_btn.clicked.connect(self.reject)
+        
+        button_layout.addWidget(save_btn)
+        button_layout.addWidget(cancel_btn)
+        layout.addRow("", button_layout)
+    
+    def browse_directory(self):
+        current = self.dir_list.currentItem()
+        dir_path = QFileDialog.getExistingDirectory(
+            self,
+            "Select Projects Directory",
+            current.text() if current else "",
+            QFileDialog.Option.ShowDirsOnly
+        )
+        if dir_path and not self.dir_list.findItems(dir_path, Qt.MatchFlag.MatchExactly):
+            self.dir_list.addItem(dir_path)
+    
+    def remove_directory(self):
+        for item in self.dir_list.selectedItems():
+            self.dir_list.takeItem(self.dir_list.row(item))
+    
+    def save_settings(self):
+        roots = [self.dir_list.item(row).text() for row in range(self.dir_list.count())]
+        self.parent().settings.setValue("projects_directory", os.pathsep.join(roots))
+        self.parent().settings.setValue("scan_depth", self.depth_input.value())
+        self.parent().settings.sync()
+        self.accept()
+        # Reload projects with new directories
+        self.parent().request_reload()
+
+class ProjectMenu(QMainWindow):
+    RETRY_DELAY = 5  # seconds before the first retry of an unavailable root
+    MAX_RETRY_DELAY = 300
+    PROBE_WORKERS = 2
+    INSTALL_WORKERS = 1
+    
+    def __init__(self, settings=None, index=None, snapshot_path=None):
+        super().__init__()
+        self.setWindowTitle("Cursor Projects Menu")
+        self.setGeometry(100, 100, 800, 600)
+        
+        apply_app_stylesheet()
+        
+        # Initialize settings
+        self.settings = settings if settings is not None else QSettings("CursorProjects", "Menu")
+        
+        # Persistent scan cache stored next to the settings file
+        self.index = index if index is not None else ProjectIndex(default_index_path())
+        self.readme_cache = ReadmeCache()
+        
+        # Git status and launch environments are probed on a small low-priority pool of
+        # its own, so at most PROBE_WORKERS git processes run at once and scans are never
+        # queued behind them
+        self.git_cache = GitStatusCache(self.index)
+        self.environments = EnvironmentResolver()
+        self.probe_pool = QThreadPool(self)
+        self.probe_pool.setMaxThreadCount(self.PROBE_WORKERS)
+        self.probe_pool.setThreadPriority(QThread.Priority.LowPriority)
+        self.probe_workers = set()
+        
+        # Optional dependency installs ahead of the first launch, one at a time. Each
+        # project is tried once per session, so a failing install is not repeated.
+        self.prewarm_installs = self.settings.value("prewarm_installs", False, type=bool)
+        self.install_pool = QThreadPool(self)
+        self.install_pool.setMaxThreadCount(self.INSTALL_WORKERS)
+        self.install_pool.setThreadPriority(QThread.Priority.LowPriority)
+        self.install_workers = set()
+        self.install_attempted = set()
+        
+        # Activity stats order the grid; they are sampled after git status, lowest of all
+        self.activity = ActivityTracker(self.index)
+        self.sort_mode = self.settings.value("sort_mode", "recent")
+        
+        # Last shown grid, painted at startup until the scan confirms or replaces each card
+        self.snapshot_path = snapshot_path if snapshot_path is not None else default_snapshot_path()
+        self.unconfirmed = set()  # snapshot paths the running scan has not found yet
+        
+        # Create menu bar
+        self.create_menu_bar()
+        
+        # Create central widget and layout
+        central_widget = QWidget()
+        self.setCentralWidget(central_widget)
+        main_layout = QVBoxLayout(central_widget)
+        
+        # Add title label
+        title = QLabel("My Projects")
+        title.setProperty("role", "title")
+        title.setAlignment(Qt.AlignmentFlag.AlignCenter)
+        main_layout.addWidget(title)
+        
+        # Error message shown in place of the grid
+        self.error_label = QLabel()
+        self.error_label.setProperty("role", "error")
+        self.error_label.hide()
+        main_layout.addWidget(self.error_label)
+        
+        # Search box filtering the grid through an in-memory index (no cards are rebuilt)
+        self.search_index = ProjectSearchIndex()
+        self.search_box = QLineEdit()
+        self.search_box.setPlaceholderText("Search projects...")
+        self.search_box.setClearButtonEnabled(True)
+        self.search_box.textChanged.connect(self.apply_search)
+        main_layout.addWidget(self.search_box)
+        
+        # Project grid: a virtualized icon-mode list painted by the card delegate
+        self.project_model = ProjectListModel(self)
+        self.project_model.set_sort_mode(self.sort_mode)
+        self.project_view = QListView()
+        self.project_view.setModel(self.project_model)
+        self.project_view.setItemDelegate(ProjectCardDelegate(self.project_view))
+        self.project_view.setViewMode(QListView.ViewMode.IconMode)
+        self.project_view.setResizeMode(QListView.ResizeMode.Adjust)
+        self.project_view.setMovement(QListView.Movement.Static)
+        self.project_view.setUniformItemSizes(True)
+        self.project_view.setLayoutMode(QListView.LayoutMode.Batched)
+        self.project_view.setGridSize(ProjectCardDelegate.CARD_SIZE + QSize(15, 15))
+        self.project_view.setSelectionMode(QAbstractItemView.SelectionMode.NoSelection)
+        self.project_view.setEditTriggers(QAbstractItemView.EditTrigger.NoEditTriggers)
+        self.project_view.setMouseTracking(True)
+        self.project_view.viewport().setAttribute(Qt.WidgetAttribute.WA_Hover)
+        self.project_view.viewport().setCursor(Qt.CursorShape.PointingHandCursor)
+        self.project_view.viewport().installEventFilter(self)
+        self.project_view.doubleClicked.connect(
+            lambda index: self.launch_project(self.project_model.record(index)))
+        self.project_view.entered.connect(self.hover_project)
+        self.project_view.viewportEntered.connect(self.hide_tooltip)
+        self.project_view.verticalScrollBar().valueChanged.connect(self.hide_tooltip)
+        main_layout.addWidget(self.project_view)
+        
+        # One tooltip and timer shared by every card
+        self.tooltip = ProjectTooltip(self)
+        self.tooltip_timer = QTimer(self)
+        self.tooltip_timer.setSingleShot(True)
+        self.tooltip_timer.timeout.connect(self.show_tooltip)
+        self.hovered_index = QPersistentModelIndex()
+        
+        # Watch the roots and every folder found so only affected cards are refreshed.
+        # Adding a watch touches the disk on the GUI thread, so only roots that answered
+        # the latest scan within the probe timeout are watched.
+        self.watcher = QFileSystemWatcher(self)
+        self.watcher.directoryChanged.connect(self.queue_refresh)
+        self.watcher.fileChanged.connect(self.queue_refresh)
+        self.watched_projects = {}  # folder path -> depth below its root
+        self.answered_roots = set()
+        self.unwatched = {}  # root -> records found before it answered
+        self.pending_refresh = set()
+        self.refresh_timer = QTimer(self)
+        self.refresh_timer.setSingleShot(True)
+        self.refresh_timer.setInterval(300)
+        self.refresh_timer.timeout.connect(self.refresh_changed_projects)
+        self.refresh_workers = set()
+        self.roots = []
+        self.max_depth = DEFAULT_SCAN_DEPTH
+        
+        # Roots that stopped answering show cached cards and are retried with backoff
+        self.degraded_roots = {}  # root -> failed attempts
+        self.root_errors = {}  # root -> message
+        self.retry_workers = {}  # root -> worker
+        self.prefetch_workers = set()
+        self.describing = set()  # paths of hovered cards whose README is being parsed
+        
+        # Launched projects and their output windows, by project path
+        self.processes = ProcessRegistry()
+        self.output_dialogs = {}
+        
+        # Scan progress shown in the status bar while cards stream in
+        self.scan_progress = QProgressBar()
+        self.scan_progress.setMaximumWidth(200)
+        self.scan_progress.hide()
+        self.statusBar().addPermanentWidget(self.scan_progress)
+        self.scan_worker = None
+        
+        # A running index daemon (menu_app serve) replaces the local scan and watchers;
+        # its worker keeps streaming changes after the first snapshot
+        self.subscriber = None
+        self.served = False
+        self.use_daemon = True  # until a daemon answers with errors or an unknown format
+        
+        # Each load bumps the generation; results from older loads are dropped.
+        # Reload requests arriving in a burst are coalesced into one scan.
+        self.generation = 0
+        self.reload_timer = QTimer(self)
+        self.reload_timer.setSingleShot(True)
+        self.reload_timer.setInterval(150)
+        self.reload_timer.timeout.connect(self.load_projects)
+        
+        # Load projects
+        self.load_projects()
+    
+    def create_menu_bar(self):
+        menubar = self.menuBar()
+        
+        # File menu
+        file_menu = menubar.addMenu("File")
+        
+        # Settings action
+        settings_action = QAction("Settings", self)
+        settings_action.triggered.connect(self.show_settings)
+        file_menu.addAction(settings_action)
+        
+        # Profiling actions
+        profile_action = QAction("Profile Scans", self)
+        profile_action.setCheckable(True)
+        profile_action.setChecked(profiler.enabled)
+        profile_action.toggled.connect(self.set_profiling)
+        file_menu.addAction(profile_action)
+        
+        performance_action = QAction("Performance...", self)
+        performance_action.triggered.connect(self.show_performance)
+        file_menu.addAction(performance_action)
+        
+        # Background dependency installs
+        prewarm_action = QAction("Prewarm Installs", self)
+        prewarm_action.setCheckable(True)
+        prewarm_action.setChecked(self.prewarm_installs)
+        prewarm_action.toggled.connect(self.set_prewarm_installs)
+        file_menu.addAction(prewarm_action)
+        
+        # Exit action
+        exit_action = QAction("Exit", self)
+        exit_action.triggered.connect(self.close)
+        file_menu.addAction(exit_action)
+        
+        # View menu: grid order
+        view_menu = menubar.addMenu("View")
+        sort_group = QActionGroup(self)
+        for mode, label in (('recent', "Sort by Recent Activity"),
+                            ('frequent', "Sort by Most Launched"), ('name', "Sort by Name")):
+            sort_action = QAction(label, sort_group)
+            sort_action.setCheckable(True)
+            sort_action.setChecked(mode == self.sort_mode)
+            sort_action.triggered.connect(lambda checked, mode=mode: self.set_sort_mode(mode))
+            view_menu.addAction(sort_action)
+    
+    def show_settings(self):
+        dialog = SettingsDialog(self)
+        dialog.setAttribute(Qt.WidgetAttribute.WA_DeleteOnClose)
+        dialog.exec()
+    
+    def set_profiling(self, enabled):
+        profiler.enabled = enabled
+        if enabled:
+            # Profile a full scan straight away
+            self.request_reload()
+    
+    def set_prewarm_installs(self, enabled):
+        self.prewarm_installs = enabled
+        self.settings.setValue("prewarm_installs", enabled)
+        if enabled:
+            self.queue_installs(self.project_model.readiness.items())
+    
+    def set_sort_mode(self, mode):
+        self.sort_mode = mode
+        self.settings.setValue("sort_mode", mode)
+        self.hide_tooltip()
+        self.project_model.set_sort_mode(mode)
+    
+    def show_performance(self):
+        dialog = PerformanceDialog(self)
+        dialog.setAttribute(Qt.WidgetAttribute.WA_DeleteOnClose)
+        dialog.exec()
+    
+    def request_reload(self):
+        """Schedule a full reload; repeated requests within the interval start a single scan."""
+        self.cancel_scans()
+        self.reload_timer.start()
+    
+    def cancel_scans(self):
+        # Start a new generation so queued results from the old one are ignored
+        self.generation += 1
+        if self.scan_worker is not None:
+            self.scan_worker.cancel()
+            self.scan_worker = None
+        if self.subscriber is not None:
+            self.subscriber.cancel()
+            self.subscriber = None
+        for worker in (list(self.retry_workers.values()) + list(self.refresh_workers)
+                       + list(self.prefetch_workers) + list(self.probe_workers)):
+            worker.cancel()
+        self.retry_workers = {}
+        self.refresh_workers = set()
+        self.prefetch_workers = set()
+        self.describing = set()
+        self.probe_workers = set()
+        self.refresh_timer.stop()
+        self.scan_progress.hide()
+    
+    def load_projects(self):
+        # Stop any scan that is still streaming into the old grid
+        self.reload_timer.stop()
+        self.cancel_scans()
+        self.degraded_roots = {}
+        self.root_errors = {}
+        self.answered_roots = set()
+        self.served = False
+        
+        # Costs reported by the performance panel cover the latest full scan
+        profiler.reset()
+        
+        # Clear existing projects
+        self.hide_tooltip()
+        self.project_model.clear()
+        # Stored stats order the grid from the first card; the pass after the scan updates them
+        self.project_model.load_activity(self.index.all_activity())
+        self.search_index = ProjectSearchIndex()
+        self.git_cache.clear()
+        self.unconfirmed = set()
+        self.update_error_label()
+        self.unwatch_all()
+        
+        # Get projects directories from settings; they are only touched off the GUI thread,
+        # so a stalled network mount cannot freeze the window
+        self.roots = parse_roots(self.settings.value("projects_directory", DEFAULT_PROJECTS_DIRECTORY))
+        self.max_depth = int(self.settings.value("scan_depth", DEFAULT_SCAN_DEPTH))
+        if not self.roots:
+            return
+        
+        # Paint the last shown grid right away; the scan then only applies what changed
+        with profiler.phase("snapshot"):
+            snapshot = load_grid_snapshot(self.snapshot_path, self.roots, self.max_depth)
+            for record in snapshot:
+                self.search_index.add(record)
+            self.project_model.upsert_records(snapshot)
+            self.unconfirmed = {record.path for record in snapshot}
+        
+        # Scan in the background (or subscribe to the index daemon); cards are added as
+        # batches arrive
+        if self.use_daemon:
+            self.scan_worker = self.subscriber = self.start_scan(self.roots, DaemonScanWorker)
+            self.scan_worker.signals.served.connect(self.daemon_served)
+            self.scan_worker.signals.daemon_lost.connect(self.daemon_lost)
+        else:
+            self.scan_worker = self.start_scan(self.roots)
+        self.scan_worker.signals.progress.connect(self.update_scan_progress)
+        self.scan_worker.signals.finished.connect(self.scan_finished)
+        self.scan_progress.setValue(0)
+        self.scan_progress.show()
+        QThreadPool.globalInstance().start(self.scan_worker)
+    
+    def start_scan(self, roots, worker_class=ProjectScanWorker):
+        worker = worker_class(roots, self.index, self.max_depth, self.generation)
+        worker.signals.batch_ready.connect(self.add_project_cards)
+        worker.signals.removed.connect(self.remove_project_cards)
+        worker.signals.root_ready.connect(self.root_ready)
+        worker.signals.degraded.connect(self.root_degraded)
+        return worker
+    
+    def root_ready(self, generation, root):
+        if generation != self.generation:
+            return
+        self.degraded_roots.pop(root, None)
+        if self.root_errors.pop(root, None) is not None:
+            self.update_error_label()
+        if self.served:
+            return
+        self.answered_roots.add(root)
+        self.watcher.addPath(root)
+        self.watch_projects(self.unwatched.pop(root, []))
+    
+    def daemon_served(self, generation):
+        if generation != self.generation:
+            return
+        # The daemon watches the disk; watching here as well would only duplicate its work
+        self.served = True
+        self.unwatch_all()
+        self.statusBar().showMessage("Projects served by the index daemon", 3000)
+    
+    def daemon_lost(self, generation, usable):
+        if generation != self.generation:
+            return
+        self.subscriber = None
+        if usable:
+            self.statusBar().showMessage("Index daemon stopped; scanning here", 3000)
+        else:
+            # Reconnecting would fail the same way and clear the grid on every attempt
+            self.use_daemon = False
+            self.statusBar().showMessage("Index daemon is not compatible; scanning here", 5000)
+        self.request_reload()
+    
+    def root_degraded(self, generation, root, reason):
+        if generation != self.generation:
+            return
+        attempts = self.degraded_roots.get(root, 0) + 1
+        self.degraded_roots[root] = attempts
+        self.answered_roots.discard(root)
+        self.unwatched.pop(root, None)
+        delay = min(self.RETRY_DELAY * 2 ** (attempts - 1), self.MAX_RETRY_DELAY)
+        self.root_errors[root] = (f"Error: {root} is unavailable ({reason}); "
+                                  f"showing cached projects, retrying in {delay}s")
+        self.update_error_label()
+        # Owned by the window, so a pending retry dies with it
+        timer = QTimer(self)
+        timer.setSingleShot(True)
+        timer.timeout.connect(lambda: self.retry_root(generation, root))
+        timer.timeout.connect(timer.deleteLater)
+        timer.start(delay * 1000)
+    
+    def retry_root(self, generation, root):
+        if (generation != self.generation or root not in self.degraded_roots
+                or root in self.retry_workers):
+            return  # reloaded, recovered or already retrying
+        worker = self.start_scan([root])
+        worker.signals.finished.connect(self.worker_finished)
+        self.retry_workers[root] = worker
+        QThreadPool.globalInstance().start(worker)
+    
+    def worker_finished(self, generation):
+        """Forget a finished background worker.
+        
+        Workers report here through a bound method rather than a lambda, so Qt drops the
+        connection when the window is destroyed and a late signal never reaches it.
+        """
+        signals = self.sender()
+        self.retry_workers = {root: worker for root, worker in self.retry_workers.items()
+                              if worker.signals is not signals}
+        for workers in (self.refresh_workers, self.prefetch_workers, self.probe_workers,
+                        self.install_workers):
+            workers.difference_update([worker for worker in workers if worker.signals is signals])
+    
+    def degraded_root(self, path):
+        """Return the unavailable root path lives under, if any."""
+        for root in self.degraded_roots:
+            if path.startswith(os.path.join(root, "")):
+                return root
+        return None
+    
+    def update_error_label(self):
+        # One line per unavailable root
+        self.error_label.setText("\n".join(self.root_errors.values()))
+        self.error_label.setVisible(bool(self.root_errors))
+    
+    def add_project_cards(self, generation, records):
+        if generation != self.generation:
+            return
+        self.unconfirmed.difference_update(record.path for record in records)
+        with profiler.phase("watch"):
+            self.watch_projects(records)
+        with profiler.phase("search_index"):
+            for record in records:
+                if record.is_valid:
+                    self.search_index.add(record)
+                else:
+                    self.search_index.remove(record.path)
+        with profiler.phase("model"):
+            self.project_model.upsert_records(records)
+        if self.project_model.filtered:
+            self.apply_search()
+        if self.scan_worker is None:
+            # Refreshed cards; a full scan prefetches everything once it finishes
+            self.prefetch_readmes(records)
+            self.fetch_readiness(records)
+            self.fetch_git_status(records)
+            self.fetch_activity(records)
+    
+    def remove_project_cards(self, generation, paths):
+        if generation != self.generation:
+            return
+        self.unwatch_projects(paths)
+        self.git_cache.forget(paths)
+        for path in paths:
+            self.search_index.remove(path)
+        self.project_model.remove_paths(paths)
+    
+    def apply_search(self):
+        self.hide_tooltip()
+        self.project_model.set_filter(self.search_index.search(self.search_box.text()))
+    
+    def prefetch_readmes(self, records):
+        """Parse the READMEs not yet described in the background, below scans in priority."""
+        projects = [(record.path, record.name, record.readme_path, record.readme_mtime)
+                    for record in records
+                    if record.is_valid and record.readme_path and record.description is None
+                    and not record.cached]
+        if not projects:
+            return
+        worker = ReadmePrefetchWorker(projects, self.index, self.generation)
+        worker.signals.described.connect(self.readme_described)
+        worker.signals.finished.connect(self.worker_finished)
+        self.prefetch_workers.add(worker)
+        QThreadPool.globalInstance().start(worker, -1)
+    
+    def describe_project(self, record):
+        """Parse a hovered card's README on the pool, ahead of scans; readme_described shows it."""
+        if record.path in self.describing:
+            return
+        self.describing.add(record.path)
+        worker = ReadmePrefetchWorker([(record.path, record.name, record.readme_path,
+                                        record.readme_mtime)],
+                                      self.index, self.generation, cache=self.readme_cache)
+        worker.signals.described.connect(self.readme_described)
+        worker.signals.finished.connect(self.worker_finished)
+        self.prefetch_workers.add(worker)
+        QThreadPool.globalInstance().start(worker, 1)
+    
+    def fetch_git_status(self, records):
+        """Read the git status of projects in the background, after scans and README parsing."""
+        records = [record for record in records if record.is_valid and not record.cached]
+        if not records:
+            return
+        git_cache = self.git_cache
+        worker = ProjectProbeWorker(records, lambda record: git_cache.get(record.path),
+                                    self.generation, self.index)
+        worker.signals.probed.connect(self.git_status_ready)
+        worker.signals.finished.connect(self.worker_finished)
+        self.probe_workers.add(worker)
+        self.probe_pool.start(worker, -2)
+    
+    def git_status_ready(self, generation, items):
+        if generation == self.generation:
+            self.project_model.set_git_status(items)
+    
+    def fetch_readiness(self, records):
+        """Resolve the interpreter and dependency state of launchable projects in the background."""
+        records = [record for record in records
+                   if record.is_valid and not record.cached and record.launch_kind]
+        if not records:
+            return
+        worker = ProjectProbeWorker(records, self.environments.resolve, self.generation)
+        worker.signals.probed.connect(self.readiness_ready)
+        worker.signals.finished.connect(self.worker_finished)
+        self.probe_workers.add(worker)
+        self.probe_pool.start(worker, -2)
+    
+    def fetch_activity(self, records):
+        """Sample when projects were last modified, in the background, after everything else."""
+        records = [record for record in records if record.is_valid and not record.cached]
+        if not records:
+            return
+        worker = ProjectProbeWorker(records, self.activity.get, self.generation, self.index)
+        worker.signals.probed.connect(self.activity_ready)
+        worker.signals.finished.connect(self.worker_finished)
+        self.probe_workers.add(worker)
+        self.probe_pool.start(worker, -3)
+    
+    def activity_ready(self, generation, items):
+        if generation == self.generation:
+            self.project_model.set_activity(items)
+    
+    def readiness_ready(self, generation, items):
+        if generation != self.generation:
+            return
+        self.project_model.set_readiness(items)
+        self.queue_installs(items)
+    
+    def queue_installs(self, items):
+        """Install missing or stale dependencies in the background when prewarming is on."""
+        if not self.prewarm_installs:
+            return
+        for path, environment in items:
+            if (environment is None or environment.ready is not False or not environment.install
+                    or path in self.install_attempted or self.degraded_root(path) is not None):
+                continue
+            self.install_attempted.add(path)
+            worker = InstallWorker(path, environment, self.generation)
+            worker.signals.installed.connect(self.install_finished)
+            worker.signals.finished.connect(self.worker_finished)
+            self.install_workers.add(worker)
+            self.install_pool.start(worker)
+    
+    def install_finished(self, generation, path, succeeded):
+        # Probed again even after a reload: the new load's pass may have run mid-install
+        record = self.project_model.all_records.get(path)
+        if record is None:
+            return
+        if not succeeded:
+            self.statusBar().showMessage(f"Installing dependencies of {record.name} failed", 5000)
+        self.fetch_readiness([record])
+    
+    def readme_described(self, generation, items):
+        if generation != self.generation:
+            return
+        paths = set()
+        for path, title, description in items:
+            paths.add(path)
+            self.describing.discard(path)
+            record = self.project_model.all_records.get(path)
+            if record is not None and record.description is None:
+                record.title = title
+                record.description = description
+                self.search_index.add(record)
+        if self.project_model.filtered:
+            self.apply_search()
+        elif self.hovered_index.isValid() and self.tooltip.isVisible():
+            # Replace "Loading..." once the hovered card's README is parsed
+            if self.project_model.record(QModelIndex(self.hovered_index)).path in paths:
+                self.show_tooltip()
+    
+    def watch_projects(self, records):
+        """Watch each project folder plus the marker files whose edits change its card.
+
+        Records of a root that has not answered yet wait in unwatched for root_ready.
+        """
+        if self.served:
+            return
+        paths = []
+        for record in records:
+            if record.cached:
+                continue  # not read from disk this time
+            root = root_of(record.path, record.depth)
+            if root not in self.answered_roots:
+                self.unwatched.setdefault(root, []).append(record)
+                continue
+            if record.path not in self.watched_projects:
+                paths.append(record.path)
+            self.watched_projects[record.path] = record.depth
+            if record.readme_path:
+                paths.append(record.readme_path)
+            if record.package_mtime is not None:
+                paths.append(os.path.join(record.path, "package.json"))
+            # requirements.txt and pyproject.toml decide framework types
+            paths += [os.path.join(record.path, name) for name in record.manifest_mtimes or ()]
+        watched = set(self.watcher.files())
+        paths = [path for path in paths if path not in watched]
+        if paths:
+            self.watcher.addPaths(paths)
+    
+    def unwatch_projects(self, project_paths):
+        prefixes = tuple(os.path.join(path, "") for path in project_paths)
+        stale = [path for path in self.watcher.files() if path.startswith(prefixes)]
+        stale += [path for path in project_paths if path in self.watched_projects]
+        for path in project_paths:
+            self.watched_projects.pop(path, None)
+        if stale:
+            self.watcher.removePaths(stale)
+    
+    def unwatch_all(self):
+        paths = self.watcher.files() + self.watcher.directories()
+        if paths:
+            self.watcher.removePaths(paths)
+        self.watched_projects = {}
+        self.unwatched = {}
+        self.pending_refresh = set()
+    
+    def queue_refresh(self, path):
+        # Coalesce bursts of events (e.g. a git clone) into one refresh
+        if path in self.roots or path in self.watched_projects:
+            self.pending_refresh.add(path)
+        else:
+            self.pending_refresh.add(os.path.dirname(path))
+        if not self.refresh_timer.isActive():
+            self.refresh_timer.start()
+    
+    def refresh_changed_projects(self):
+        # One refresh at a time: events arriving meanwhile are coalesced into the next one,
+        # so two workers never re-walk the same folder
+        if not self.pending_refresh or self.refresh_workers:
+            return
+        worker = ProjectRefreshWorker(list(self.roots), self.pending_refresh,
+                                      dict(self.watched_projects), self.index, self.max_depth,
+                                      self.generation)
+        self.pending_refresh = set()
+        worker.signals.batch_ready.connect(self.add_project_cards)
+        worker.signals.removed.connect(self.remove_project_cards)
+        worker.signals.finished.connect(self.refresh_finished)
+        self.refresh_workers.add(worker)
+        QThreadPool.globalInstance().start(worker)
+    
+    def refresh_finished(self, generation):
+        self.worker_finished(generation)
+        if self.pending_refresh and not self.refresh_timer.isActive():
+            self.refresh_timer.start()
+    
+    def hover_project(self, index):
+        self.tooltip.hide()
+        self.hovered_index = QPersistentModelIndex(index)
+        self.tooltip_timer.start(500)  # Show tooltip after 500ms
+    
+    def hide_tooltip(self):
+        self.tooltip_timer.stop()
+        self.tooltip.hide()
+        self.hovered_index = QPersistentModelIndex()
+    
+    def show_tooltip(self):
+        if not self.hovered_index.isValid():
+            return
+        index = QModelIndex(self.hovered_index)
+        record = self.project_model.record(index)
+        description = record.description
+        if description is None:
+            # Never read a README from a root that is not answering
+            root = self.degraded_root(record.path)
+            if root is not None:
+                description = f"{root} is not responding"
+            elif not record.readme_path:
+                record.title = record.name
+                record.description = description = 'No description available'
+            else:
+                # Never read on the GUI thread: a stalled mount would freeze the window
+                self.describe_project(record)
+                description = "Loading..."
+        environment = self.project_model.readiness.get(record.path)
+        if environment is not None and environment.detail:
+            description = f"{description}\n\n{environment.detail}"
+        rect = self.project_view.visualRect(index)
+        pos = self.project_view.viewport().mapToGlobal(rect.topLeft())
+        self.tooltip.show_tooltip({'description': description}, pos)
+    
+    def eventFilter(self, obj, event):
+        if event.type() == QEvent.Type.Leave and obj is self.project_view.viewport():
+            self.hide_tooltip()
+        return super().eventFilter(obj, event)
+    
+    def update_scan_progress(self, generation, done, total):
+        if generation != self.generation:
+            return
+        self.scan_progress.setMaximum(max(total, 1))
+        self.scan_progress.setValue(done)
+    
+    def scan_finished(self, generation):
+        if generation != self.generation:
+            return
+        self.scan_progress.hide()
+        self.scan_worker = None
+        # Snapshot cards the scan did not find have gone, unless their root is not answering
+        gone = [path for path in self.unconfirmed if self.degraded_root(path) is None]
+        self.unconfirmed = set()
+        if gone:
+            self.remove_project_cards(generation, gone)
+        self.save_snapshot()
+        self.prefetch_readmes(self.project_model.all_records.values())
+        self.fetch_readiness(self.project_model.all_records.values())
+        self.fetch_git_status(self.project_model.all_records.values())
+        self.fetch_activity(self.project_model.all_records.values())
+    
+    def save_snapshot(self):
+        if self.roots:
+            save_grid_snapshot(self.snapshot_path, self.roots, self.max_depth,
+                               self.project_model.all_records.values())
+    
+    def closeEvent(self, event):
+        # Launched projects are children of the menu (their output is piped to it)
+        running = self.processes.running()
+        if running:
+            reply = QMessageBox.question(
+                self, "Running Projects",
+                f"Stop {len(running)} running project(s) and exit?",
+                QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No)
+            if reply != QMessageBox.StandardButton.Yes:
+                event.ignore()
+                return
+            # Stopped in the background; the interpreter waits for them before exiting
+            self.processes.stop_all()
+        self.reload_timer.stop()
+        if self.scan_worker is None:
+            # Keeps descriptions parsed since the scan finished
+            self.save_snapshot()
+        self.cancel_scans()
+        self.probe_pool.clear()
+        # A running install is killed; it is tried again next session
+        self.install_pool.clear()
+        for worker in self.install_workers:
+            worker.cancel()
+        self.install_workers = set()
+        super().closeEvent(event)
+    
+    def launch_project(self, record):
+        """Launch from the plan resolved during scanning and the environment probed since."""
+        root = self.degraded_root(record.path)
+        if root is not None:
+            QMessageBox.warning(self, "Unavailable", f"{root} is not responding; try again later.")
+            return
+        process = self.processes.get(record.path)
+        if process is not None and process.busy:
+            # Already running: bring its output forward instead of starting a duplicate
+            self.show_output(record)
+            return
+        # Only the probed environment: resolving one here would stat on the click path
+        environment = self.project_model.readiness.get(record.path)
+        if record.launch_kind == 'npm':
+            # Node.js project - show launch dialog
+            dialog = NodeLaunchDialog(record, environment, self)
+            dialog.setAttribute(Qt.WidgetAttribute.WA_DeleteOnClose)
+            dialog.exec()
+        elif record.launch_kind == 'python':
+            try:
+                self.start_project(record, launch_command(record, environment=environment))
+            except OSError as e:
+                QMessageBox.critical(self, "Error", f"Failed to launch {record.name}: {str(e)}")
+    
+    def start_project(self, record, command, count_launch=True):
+        self.processes.launch(record.path, command)
+        if count_launch:
+            self.project_model.set_activity([(record.path, self.activity.record_launch(record.path))])
+        self.show_output(record)
+    
+    def show_output(self, record):
+        process = self.processes.get(record.path)
+        dialog = self.output_dialogs.get(record.path)
+        if dialog is None:
+            dialog = ProcessOutputDialog(record, self.processes, self)
+            self.output_dialogs[record.path] = dialog
+        elif dialog.process is not process:
+            dialog.attach(process)
+        dialog.show()
+        dialog.raise_()
+        dialog.activateWindow()
+
+def main():
+    app = QApplication(sys.argv)
+    window = ProjectMenu()
+    window.show()
+    sys.exit(app.exec())
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,2767 @@
+"""Project scanning, caching and launch resolution shared by the GUI and the CLI (no Qt)."""
+import os
+import sys
+import json
+import re
+import sqlite3
+import argparse
+import subprocess
+import threading
+import time
+import configparser
+import queue
+import bisect
+import signal
+import shutil
+import shlex
+import hashlib
+import secrets
+import socket
+import socketserver
+from collections import OrderedDict, deque
+from operator import attrgetter
+from contextlib import nullcontext
+from concurrent.futures import Future, FIRST_COMPLETED, wait
+try:
+    import tomllib
+except ImportError:  # Python < 3.11: dependencies in pyproject.toml are not read
+    tomllib = None
+
+class ScanPhase:
+    def __init__(self, profiler, name):
+        self.profiler = profiler
+        self.name = name
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+
+    def __exit__(self, *exc):
+        self.profiler.add_time(self.name, time.perf_counter() - self.start)
+
+class ScanProfiler:
+    """Per-phase and per-project scan costs, collected only while enabled."""
+    DISABLED = nullcontext()
+
+    def __init__(self, enabled=False):
+        self.enabled = enabled
+        self.lock = threading.Lock()
+        self.local = threading.local()
+        self.reset()
+
+    def reset(self):
+        with self.lock:
+            self.phases = {}    # phase -> [seconds, calls]
+            self.projects = {}  # project path -> cost dict
+
+    def project(self, project_path):
+        """Attribute costs recorded on this thread to project_path until the block exits."""
+        if not self.enabled:
+            return self.DISABLED
+        return ScanProject(self, project_path)
+
+    def phase(self, name):
+        if not self.enabled:
+            return self.DISABLED
+        return ScanPhase(self, name)
+
+    def project_costs(self):
+        path = getattr(self.local, 'project', None)
+        if path is None:
+            return None
+        costs = self.projects.get(path)
+        if costs is None:
+            costs = self.projects[path] = {'seconds': 0.0, 'syscalls': 0, 'bytes_read': 0,
+                                           'phases': {}}
+        return costs
+
+    def add_time(self, name, seconds):
+        with self.lock:
+            totals = self.phases.setdefault(name, [0.0, 0])
+            totals[0] += seconds
+            totals[1] += 1
+            costs = self.project_costs()
+            if costs is not None:
+                costs['phases'][name] = costs['phases'].get(name, 0.0) + seconds
+
+    def count(self, syscalls=0, bytes_read=0):
+        if not self.enabled:
+            return
+        with self.lock:
+            costs = self.project_costs()
+            if costs is not None:
+                costs['syscalls'] += syscalls
+                costs['bytes_read'] += bytes_read
+
+    def report(self, slowest=10):
+        """Summarize the collected costs as a JSON-serializable dict."""
+        with self.lock:
+            projects = [{'path': path,
+                         'seconds': round(costs['seconds'], 6),
+                         'syscalls': costs['syscalls'],
+                         'bytes_read': costs['bytes_read'],
+                         'phases': {name: round(seconds, 6)
+                                    for name, seconds in costs['phases'].items()}}
+                        for path, costs in self.projects.items()]
+            phases = {name: {'seconds': round(seconds, 6), 'calls': calls}
+                      for name, (seconds, calls) in self.phases.items()}
+        mounts = {}
+        for costs in projects:
+            mount = mounts.setdefault(os.path.dirname(costs['path']),
+                                      {'seconds': 0.0, 'projects': 0, 'syscalls': 0})
+            mount['seconds'] += costs['seconds']
+            mount['projects'] += 1
+            mount['syscalls'] += costs['syscalls']
+        for mount in mounts.values():
+            mount['seconds'] = round(mount['seconds'], 6)
+        projects.sort(key=lambda costs: costs['seconds'], reverse=True)
+        return {
+            'enabled': self.enabled,
+            'phases': phases,
+            'totals': {
+                'projects': len(projects),
+                'seconds': round(sum(costs['seconds'] for costs in projects), 6),
+                'syscalls': sum(costs['syscalls'] for costs in projects),
+                'bytes_read': sum(costs['bytes_read'] for costs in projects),
+            },
+            'mounts': mounts,
+            'slowest': projects[:slowest],
+        }
+
+class ScanProject:
+    def __init__(self, profiler, project_path):
+        self.profiler = profiler
+        self.project_path = project_path
+
+    def __enter__(self):
+        self.profiler.local.project = self.project_path
+        self.start = time.perf_counter()
+
+    def __exit__(self, *exc):
+        elapsed = time.perf_counter() - self.start
+        with self.profiler.lock:
+            costs = self.profiler.project_costs()
+            costs['seconds'] += elapsed
+        self.profiler.local.project = None
+
+# Shared profiler; set MENU_APP_PROFILE=1 to collect costs from startup
+profiler = ScanProfiler(enabled=os.environ.get("MENU_APP_PROFILE") == "1")
+
+PROJECT_CONFIG_FILES = frozenset([
+    "package.json",      # Node.js
+    "requirements.txt",   # Python
+    "setup.py",          # Python
+    "pyproject.toml",    # Python (modern)
+    "Cargo.toml",        # Rust
+    "pom.xml",          # Java/Maven
+    "build.gradle",      # Java/Gradle
+    "composer.json",     # PHP
+    "Gemfile",          # Ruby
+    "go.mod",           # Go
+    "tsconfig.json",    # TypeScript
+    "angular.json",     # Angular
+    "vue.config.js",    # Vue.js
+    "next.config.js",   # Next.js
+    "nuxt.config.js",   # Nuxt.js
+    "webpack.config.js", # Webpack
+    "vite.config.js",   # Vite
+    "docker-compose.yml", # Docker
+    "Dockerfile",       # Docker
+    ".env",             # Environment config
+    "config.json",      # Generic config
+    "app.json",         # React Native
+    "pubspec.yaml",     # Flutter
+    "CMakeLists.txt",   # C/C++
+    "Makefile",         # C/C++/Generic
+    "mix.exs",          # Elixir
+    "project.clj",      # Clojure
+    "build.sbt",        # Scala
+    "build.xml",        # Ant
+    "bower.json",       # Bower
+    "yarn.lock",        # Yarn
+    "pnpm-lock.yaml",   # pnpm
+    "package-lock.json" # npm
+])
+
+# Source code file extensions
+SOURCE_EXTENSIONS = frozenset([
+    # Web
+    '.html', '.htm', '.js', '.jsx', '.ts', '.tsx', '.css', '.scss', '.sass', '.less',
+    # Python
+    '.py', '.pyx', '.pyd', '.pyi',
+    # Java
+    '.java', '.class', '.jar',
+    # C/C++
+    '.c', '.cpp', '.h', '.hpp', '.cc', '.cxx',
+    # Go
+    '.go',
+    # Rust
+    '.rs',
+    # PHP
+    '.php',
+    # Ruby
+    '.rb',
+    # Swift
+    '.swift',
+    # Kotlin
+    '.kt', '.kts',
+    # C#
+    '.cs',
+    # F#
+    '.fs',
+    # Scala
+    '.scala',
+    # Dart
+    '.dart',
+    # CoffeeScript
+    '.coffee',
+    # Lua
+    '.lua',
+    # Shell
+    '.sh', '.bash', '.zsh',
+    # PowerShell
+    '.ps1',
+    # Batch
+    '.bat', '.cmd',
+    # SQL
+    '.sql',
+    # Database
+    '.db', '.sqlite', '.sqlite3',
+    # Markup
+    '.md', '.rst', '.txt',
+    # Config
+    '.json', '.yaml', '.yml', '.toml', '.ini', '.cfg', '.conf',
+    # Other
+    '.exe', '.dll', '.so', '.dylib'
+])
+
+# Common project directories
+PROJECT_DIRS = frozenset([
+    'src', 'source', 'app', 'lib', 'libs', 'bin', 'dist', 'build',
+    'public', 'static', 'assets', 'resources', 'tests', 'test',
+    'docs', 'examples', 'samples', 'scripts', 'tools', 'utils',
+    'components', 'pages', 'views', 'controllers', 'models',
+    'templates', 'styles', 'themes', 'config', 'conf', 'settings',
+    'migrations', 'seeds', 'fixtures', 'data', 'content'
+])
+
+# Marker files checked in order when no framework-specific match applies
+PROJECT_TYPE_MARKERS = [
+    ("Cargo.toml", "🦀", "Rust"),
+    ("pom.xml", "☕", "Java"),
+    ("build.gradle", "☕", "Gradle"),
+    ("composer.json", "🐘", "PHP"),
+    ("Gemfile", "💎", "Ruby"),
+    ("go.mod", "🦫", "Go"),
+    ("pubspec.yaml", "🎯", "Flutter"),
+    ("CMakeLists.txt", "⚙️", "C/C++"),
+    ("mix.exs", "💧", "Elixir"),
+    ("project.clj", "🧪", "Clojure"),
+    ("build.sbt", "⚡", "Scala"),
+    ("Dockerfile", "🐳", "Docker"),
+]
+
+WEB_EXTENSIONS = frozenset(['.html', '.js', '.css', '.ts', '.jsx', '.tsx'])
+
+# Project type rules, first match wins. A rule matches a folder holding every name in
+# "requires" and, if it has triggers, at least one of them: a file or folder name
+# ("files"), an extension ("extensions") or a dependency declared in package.json,
+# requirements.txt or pyproject.toml ("packages"). Rules from the user's rule file
+# come first; the last rule here matches everything.
+PROJECT_TYPE_RULES = [
+    {'type': "Next.js", 'icon': "⚛️", 'requires': ["package.json"],
+     'files': ["next.config.js", "next.config.mjs", "next.config.ts"], 'packages': ["next"]},
+    {'type': "Nuxt.js", 'icon': "💚", 'requires': ["package.json"],
+     'files': ["nuxt.config.js", "nuxt.config.ts"], 'packages': ["nuxt"]},
+    {'type': "Angular", 'icon': "🅰️", 'requires': ["package.json"],
+     'files': ["angular.json"], 'packages': ["@angular/core"]},
+    {'type': "Vue.js", 'icon': "⚡", 'requires': ["package.json"],
+     'files': ["vue.config.js"], 'packages': ["vue"]},
+    {'type': "React", 'icon': "⚛️", 'requires': ["package.json"],
+     'packages': ["react-scripts", "react"]},
+    {'type': "Node.js", 'icon': "📦", 'requires': ["package.json"]},
+    {'type': "Django", 'icon': "🐍", 'files': ["manage.py"], 'packages': ["django"]},
+    {'type': "FastAPI", 'icon': "⚡", 'packages': ["fastapi"]},
+    {'type': "Flask", 'icon': "🌶️", 'files': ["flask_app.py"], 'packages': ["flask"]},
+    {'type': "Python", 'icon': "🐍",
+     'files': ["requirements.txt", "pyproject.toml", "setup.py", "Pipfile"]},
+] + [{'type': project_type, 'icon': icon, 'files': [marker]}
+     for marker, icon, project_type in PROJECT_TYPE_MARKERS] + [
+    {'type': "Web", 'icon': "🌐", 'extensions': sorted(WEB_EXTENSIONS)},
+    {'type': "Project", 'icon': "📁"},
+]
+RULE_LIST_FIELDS = ('requires', 'files', 'extensions', 'packages')
+
+def user_type_rules_path():
+    return os.path.join(settings_dir(), "project_types.json")
+
+def load_user_type_rules(rules_path=None):
+    """Return the valid rules of the user's rule file (a JSON list), or [] if there is none."""
+    rules_path = rules_path or user_type_rules_path()
+    try:
+        with open(rules_path, 'r', encoding='utf-8') as f:
+            rules = json.load(f)
+    except FileNotFoundError:
+        return []
+    except (OSError, ValueError) as e:
+        print(f"Error reading {rules_path}: {e}")
+        return []
+    if not isinstance(rules, list):
+        print(f"Error reading {rules_path}: expected a list of rules")
+        return []
+    valid = []
+    for rule in rules:
+        if (isinstance(rule, dict) and isinstance(rule.get('type'), str)
+                and isinstance(rule.get('icon'), str)
+                and all(isinstance(rule.get(field, []), list)
+                        and all(isinstance(value, str) for value in rule.get(field, []))
+                        for field in RULE_LIST_FIELDS)):
+            valid.append(rule)
+        else:
+            print(f"Ignoring invalid project type rule in {rules_path}: {rule!r}")
+    return valid
+
+def normalize_package_name(name):
+    """Compare dependency names the way pip does: case-insensitive, with -, _ and . alike."""
+    return re.sub(r'[-_.]+', '-', name).lower()
+
+class ProjectTypeRules:
+    """Project type rules compiled into lookups by file name, extension and dependency.
+
+    Detection looks up each name and extension of a folder once and keeps the first
+    rule that matches, so its cost does not grow with the number of rules. Manifests
+    are only read when a rule ahead of the best match so far depends on a package.
+    """
+    shared = None
+    shared_lock = threading.Lock()
+
+    def __init__(self, rules):
+        self.types = []  # rule id -> (icon, type)
+        self.requires = []  # rule id -> frozenset of names
+        self.by_name = {}  # name -> rule ids, ascending
+        self.by_extension = {}
+        self.by_package = {}
+        self.always = []  # rule ids without triggers
+        for rule_id, rule in enumerate(rules):
+            self.types.append((rule['icon'], rule['type']))
+            self.requires.append(frozenset(rule.get('requires', ())))
+            triggers = ((self.by_name, rule.get('files', ())),
+                        (self.by_extension, rule.get('extensions', ())),
+                        (self.by_package, map(normalize_package_name, rule.get('packages', ()))))
+            triggered = False
+            for lookup, keys in triggers:
+                for key in keys:
+                    lookup.setdefault(key, []).append(rule_id)
+                    triggered = True
+            if not triggered:
+                self.always.append(rule_id)
+        self.first_package_rule = min((ids[0] for ids in self.by_package.values()),
+                                      default=len(self.types))
+        # Names and extensions that identify a project on their own
+        self.marker_names = frozenset(self.by_name)
+        self.marker_extensions = frozenset(self.by_extension)
+        # Casefolded name -> the spelling it is looked up by, for case-insensitive file systems
+        looked_up = set().union(PROJECT_CONFIG_FILES, PROJECT_DIRS, PYTHON_ENTRY_FILES,
+                                README_FILES, self.by_name, *self.requires)
+        self.canonical_names = {name.casefold(): name for name in sorted(looked_up)}
+        self.fingerprint = hashlib.sha1(
+            json.dumps(rules, sort_keys=True).encode()).hexdigest()
+
+    @classmethod
+    def get(cls):
+        """Return the rules in use: the user's rule file followed by PROJECT_TYPE_RULES."""
+        with cls.shared_lock:
+            if cls.shared is None:
+                cls.shared = cls(load_user_type_rules() + PROJECT_TYPE_RULES)
+            return cls.shared
+
+    def identifies(self, snapshot):
+        """Whether a folder holds a name or extension some rule is triggered by."""
+        return (not self.marker_names.isdisjoint(snapshot.names)
+                or not self.marker_extensions.isdisjoint(snapshot.extensions))
+
+    def best(self, rule_ids, names, best):
+        for rule_id in rule_ids:
+            if rule_id >= best:
+                break
+            if self.requires[rule_id] <= names:
+                return rule_id
+        return best
+
+    def detect(self, project_path, snapshot, manifest_mtimes=None):
+        names = snapshot.names
+        best = self.best(self.always, names, len(self.types))
+        for name in names:
+            best = self.best(self.by_name.get(name, ()), names, best)
+        for extension in snapshot.extensions:
+            best = self.best(self.by_extension.get(extension, ()), names, best)
+        if self.first_package_rule < best:
+            for package in manifests.dependencies(project_path, snapshot, manifest_mtimes):
+                best = self.best(self.by_package.get(package, ()), names, best)
+        if best == len(self.types):
+            return "📁", "Project"
+        return self.types[best]
+
+REQUIREMENT_NAME_RE = re.compile(r'\s*([A-Za-z0-9][A-Za-z0-9._-]*)')
+
+def parse_package_json(content):
+    data = json.loads(content)
+    if not isinstance(data, dict):
+        raise ValueError("package.json is not an object")
+    dependencies = set()
+    for section in ('dependencies', 'devDependencies', 'peerDependencies', 'optionalDependencies'):
+        if isinstance(data.get(section), dict):
+            dependencies.update(normalize_package_name(name) for name in data[section])
+    # Hand-edited manifests may hold anything; launching relies on name -> command strings
+    scripts = data.get('scripts')
+    scripts = ({name: command for name, command in scripts.items() if isinstance(command, str)}
+               if isinstance(scripts, dict) else {})
+    name, homepage = data.get('name'), data.get('homepage')
+    return {'name': name if isinstance(name, str) else None,
+            'homepage': homepage if isinstance(homepage, str) and homepage else None,
+            'scripts': scripts, 'dependencies': frozenset(dependencies)}
+
+def parse_requirements(content):
+    dependencies = set()
+    for line in content.decode('utf-8', errors='replace').splitlines():
+        line = line.split('#', 1)[0]
+        if line.strip().startswith('-'):
+            continue  # -r, -e, --index-url and other options
+        match = REQUIREMENT_NAME_RE.match(line)
+        if match:
+            dependencies.add(normalize_package_name(match.group(1)))
+    return {'dependencies': frozenset(dependencies)}
+
+def parse_pyproject(content):
+    if tomllib is None:
+        return {'dependencies': frozenset()}
+    data = tomllib.loads(content.decode('utf-8'))
+    project = data.get('project', {})
+    requirements = list(project.get('dependencies', []))
+    for extra in project.get('optional-dependencies', {}).values():
+        requirements += extra
+    dependencies = set()
+    for requirement in requirements:
+        match = REQUIREMENT_NAME_RE.match(requirement)
+        if match:
+            dependencies.add(normalize_package_name(match.group(1)))
+    poetry = data.get('tool', {}).get('poetry', {})
+    for table in [poetry.get('dependencies', {})] + [group.get('dependencies', {})
+                                                      for group in poetry.get('group', {}).values()]:
+        dependencies.update(normalize_package_name(name) for name in table if name != 'python')
+    return {'dependencies': frozenset(dependencies)}
+
+class ManifestCache:
+    """Parsed package.json, requirements.txt and pyproject.toml, each read at most once per mtime."""
+    PARSERS = (('package.json', parse_package_json), ('requirements.txt', parse_requirements),
+               ('pyproject.toml', parse_pyproject))
+
+    def __init__(self):
+        self.entries = {}  # manifest path -> (mtime, parsed manifest or None)
+        self.lock = threading.Lock()
+
+    def get(self, path, parse):
+        """Return a parsed manifest, or None if it is missing or unreadable."""
+        with self.lock:
+            entry = self.entries.get(path)
+        if entry is not None:
+            mtime = file_mtime(path)
+            if mtime == entry[0]:
+                return entry[1]
+        with profiler.phase("manifest"):
+            try:
+                with open(path, 'rb') as f:
+                    # The mtime of the open file, so a concurrent write is read again next time
+                    mtime = os.fstat(f.fileno()).st_mtime_ns
+                    content = f.read()
+            except OSError:
+                return None
+            profiler.count(syscalls=1, bytes_read=len(content))
+            try:
+                parsed = parse(content)
+            except Exception as e:
+                print(f"Error reading {path}: {e}")
+                parsed = None
+        with self.lock:
+            self.entries[path] = (mtime, parsed)
+        return parsed
+
+    def mtime(self, path):
+        """Return the mtime of the manifest as it was last parsed, or None."""
+        with self.lock:
+            entry = self.entries.get(path)
+        return entry[0] if entry is not None else None
+
+    def package_json(self, project_path):
+        return self.get(os.path.join(project_path, "package.json"), parse_package_json)
+
+    def dependencies(self, project_path, snapshot, manifest_mtimes=None):
+        """Return the normalized names of every dependency a project's manifests declare.
+
+        The mtime of each manifest read is added to manifest_mtimes, if given.
+        """
+        dependencies = set()
+        for name, parse in self.PARSERS:
+            if name in snapshot.files:
+                path = os.path.join(project_path, name)
+                parsed = self.get(path, parse)
+                if manifest_mtimes is not None:
+                    manifest_mtimes[name] = self.mtime(path)
+                if parsed is not None:
+                    dependencies |= parsed['dependencies']
+        return dependencies
+
+# Shared by every scan thread
+manifests = ManifestCache()
+
+class DirectorySnapshot:
+    """Names, sub-directories and file extensions of a directory, read with a single scandir.
+
+    On Windows, where names are case-insensitive, a name matching one the scanner looks
+    for in another case (a "dockerfile" or "Requirements.txt") is stored in the spelling
+    it is looked up by, and extensions are lowercased.
+    """
+    __slots__ = ('path', 'names', 'files', 'dirs', 'extensions')
+
+    def __init__(self, path):
+        self.path = path
+        self.files = set()
+        self.dirs = set()
+        canonical = ProjectTypeRules.get().canonical_names if os.name == "nt" else None
+        profiler.count(syscalls=1)
+        try:
+            with os.scandir(path) as entries:
+                for entry in entries:
+                    try:
+                        is_dir = entry.is_dir()
+                    except OSError:
+                        is_dir = False
+                    name = entry.name
+                    if canonical is not None:
+                        name = canonical.get(name.casefold(), name)
+                    if is_dir:
+                        self.dirs.add(name)
+                    else:
+                        self.files.add(name)
+        except OSError as e:
+            print(f"Error scanning {path}: {e}")
+        self.names = self.files | self.dirs
+        if canonical is not None:
+            self.extensions = {os.path.splitext(name)[1].lower() for name in self.names}
+        else:
+            self.extensions = {os.path.splitext(name)[1] for name in self.names}
+
+def detect_project_type(project_path, snapshot=None, manifest_mtimes=None):
+    """Detect the type of project and return its icon and type name.
+
+    The mtime of every manifest read on the way is added to manifest_mtimes, if given.
+    """
+    if snapshot is None:
+        snapshot = DirectorySnapshot(project_path)
+    return ProjectTypeRules.get().detect(project_path, snapshot, manifest_mtimes)
+
+def is_valid_project(project_path, snapshot=None):
+    """Check if the directory contains a valid application project."""
+    if snapshot is None:
+        snapshot = DirectorySnapshot(project_path)
+
+    # Check for configuration files
+    if not PROJECT_CONFIG_FILES.isdisjoint(snapshot.names):
+        return True
+
+    # Check for source files
+    if not SOURCE_EXTENSIONS.isdisjoint(snapshot.extensions):
+        return True
+
+    # Check for project directories
+    if not PROJECT_DIRS.isdisjoint(snapshot.dirs):
+        return True
+
+    # Check for the markers of user-defined project types
+    return ProjectTypeRules.get().identifies(snapshot)
+
+README_FILES = ['README.md', 'README.txt', 'README', 'readme.md', 'readme.txt']
+
+# Limits that keep README parsing cheap regardless of file size
+README_MAX_SCAN = 64 * 1024      # characters to search for the first heading
+README_MAX_LINE = 4096           # characters read per line
+README_MAX_PARAGRAPH = 4096      # characters kept for the first paragraph
+
+HEADING_RE = re.compile(r'^#\s*(.+)$')
+# Markdown links, code, bold and italic, stripped in a single pass
+MARKDOWN_RE = re.compile(r'\[([^\]]+)\]\([^)]+\)|`([^`]+)`|\*\*([^*]+)\*\*|\*([^*]+)\*')
+SENTENCE_RE = re.compile(r'(?<=[.!?])\s+')
+
+def find_readme(snapshot):
+    """Return the name of the preferred README file in a directory snapshot.
+
+    On Windows the snapshot spells a Readme.md as one of README_FILES, so it is found too.
+    """
+    return next((name for name in README_FILES if name in snapshot.files), None)
+
+def strip_markdown(text):
+    """Replace markdown links, code spans and emphasis with their inner text."""
+    def replace(match):
+        inner = next(group for group in match.groups() if group is not None)
+        return MARKDOWN_RE.sub(replace, inner)
+    return MARKDOWN_RE.sub(replace, text)
+
+def read_readme_info(readme_path, default_title):
+    """Stream a README and extract its first heading and the paragraph after it."""
+    info = {
+        'title': default_title,
+        'description': 'No description available'
+    }
+    
+    try:
+        with open(readme_path, 'r', encoding='utf-8', errors='replace') as f:
+            profiler.count(syscalls=1)
+            
+            # Find the first heading, giving up after README_MAX_SCAN characters
+            scanned = 0
+            title_match = None
+            while scanned < README_MAX_SCAN:
+                line = f.readline(README_MAX_LINE)
+                if not line:
+                    break
+                scanned += len(line)
+                title_match = HEADING_RE.match(line.rstrip('\r\n'))
+                if title_match:
+                    break
+            if not title_match:
+                return info
+            info['title'] = title_match.group(1).strip()
+            
+            # Collect the first paragraph after the heading
+            lines = []
+            collected = 0
+            while collected < README_MAX_PARAGRAPH:
+                line = f.readline(README_MAX_LINE)
+                if not line:
+                    break
+                line = line.strip()
+                if not line:
+                    if lines:
+                        break
+                    continue
+                lines.append(line)
+                collected += len(line)
+            profiler.count(bytes_read=scanned + collected)
+    except Exception as e:
+        print(f"Error reading README: {e}")
+        return info
+    
+    # Clean up the text and keep the first two sentences
+    desc = strip_markdown(' '.join(lines))
+    sentences = SENTENCE_RE.split(desc, maxsplit=2)
+    if len(sentences) > 2:
+        desc = ' '.join(sentences[:2])
+    
+    info['description'] = desc
+    return info
+
+def extract_readme_info(project_path, snapshot=None):
+    """Extract information from README files in the project directory."""
+    if snapshot is None:
+        snapshot = DirectorySnapshot(project_path)
+    readme = find_readme(snapshot)
+    if readme is None:
+        return {
+            'title': os.path.basename(project_path),
+            'description': 'No description available'
+        }
+    return read_readme_info(os.path.join(project_path, readme), os.path.basename(project_path))
+
+def read_package_info(project_path):
+    """Return the name, homepage and npm scripts declared in a project's package.json."""
+    # Shares the parse done by type detection
+    package = manifests.package_json(project_path)
+    if package is None:
+        return {'name': None, 'homepage': None, 'scripts': {}}
+    return {'name': package['name'], 'homepage': package['homepage'],
+            'scripts': package['scripts']}
+
+def file_mtime(path):
+    """Return the mtime of a file in nanoseconds, or None if it is missing."""
+    if not path:
+        return None
+    profiler.count(syscalls=1)
+    try:
+        return os.stat(path).st_mtime_ns
+    except OSError:
+        return None
+
+class ReadmeCache:
+    """Size-bounded LRU cache of parsed README info keyed by README path and mtime."""
+
+    def __init__(self, max_entries=256):
+        self.max_entries = max_entries
+        self.entries = OrderedDict()
+        self.lock = threading.Lock()
+
+    def get(self, readme_path, default_title):
+        """Return (info, mtime) for a README, parsing it only on a cache miss."""
+        mtime = file_mtime(readme_path)
+        key = (readme_path, mtime)
+        with self.lock:
+            info = self.entries.get(key)
+            if info is not None:
+                self.entries.move_to_end(key)
+                return info, mtime
+
+        with profiler.project(os.path.dirname(readme_path)), profiler.phase("readme"):
+            info = read_readme_info(readme_path, default_title)
+        with self.lock:
+            self.entries[key] = info
+            if len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+        return info, mtime
+
+# Type id -> (icon, type label); records store the id, so each pair exists once in memory
+PROJECT_TYPES = [(None, None)]  # id 0: not a project
+PROJECT_TYPE_IDS = {(None, None): 0}
+project_types_lock = threading.Lock()
+
+def project_type_id(icon, project_type):
+    """Intern an (icon, type label) pair and return its index in PROJECT_TYPES."""
+    key = (icon, project_type)
+    type_id = PROJECT_TYPE_IDS.get(key)
+    if type_id is None:
+        with project_types_lock:
+            type_id = PROJECT_TYPE_IDS.get(key)
+            if type_id is None:
+                type_id = PROJECT_TYPE_IDS[key] = len(PROJECT_TYPES)
+                PROJECT_TYPES.append(key)
+    return type_id
+
+RECORD_FIELDS = ('path', 'depth', 'dir_mtime', 'is_valid', 'type_id', 'readme_path',
+                 'readme_mtime', 'package_mtime', 'manifest_mtimes', 'title', 'description',
+                 'scripts', 'launch_kind', 'launch_target', 'package_name', 'homepage', 'cached')
+
+class ProjectRecord:
+    """Scan result of one folder, shared by the scanner, index, snapshot, search and grid.
+
+    Slotted, with the icon and type label kept as an index into PROJECT_TYPES, so an
+    entry costs a fixed couple of hundred bytes plus its strings. title and description
+    stay None until the README is parsed; scripts is None unless there is a package.json.
+    manifest_mtimes maps the other manifests read to detect the type to their mtimes.
+    """
+    __slots__ = RECORD_FIELDS
+    fields = attrgetter(*RECORD_FIELDS)
+
+    def __init__(self, path, depth=0, dir_mtime=None, is_valid=False, type_id=0,
+                 readme_path=None, readme_mtime=None, package_mtime=None, manifest_mtimes=None,
+                 title=None, description=None, scripts=None, launch_kind=None,
+                 launch_target=None, package_name=None, homepage=None, cached=False):
+        self.path = path
+        self.depth = depth
+        self.dir_mtime = dir_mtime
+        self.is_valid = is_valid
+        self.type_id = type_id
+        self.readme_path = readme_path
+        self.readme_mtime = readme_mtime
+        self.package_mtime = package_mtime
+        self.manifest_mtimes = manifest_mtimes
+        self.title = title
+        self.description = description
+        self.scripts = scripts
+        # Launch plan, so a double-click spawns without touching the disk
+        self.launch_kind = launch_kind
+        self.launch_target = launch_target
+        self.package_name = package_name
+        self.homepage = homepage
+        self.cached = cached  # read from the index: its root is not answering or it failed to scan
+
+    def row(self):
+        """The record's values as a tuple in RECORD_FIELDS order."""
+        return ProjectRecord.fields(self)
+
+    @classmethod
+    def from_row(cls, row):
+        return cls(*row)
+
+    def __eq__(self, other):
+        if not isinstance(other, ProjectRecord):
+            return NotImplemented
+        return self.row() == other.row()
+
+    __hash__ = None
+
+    def __repr__(self):
+        return f"ProjectRecord({self.path!r}, type={self.type!r})"
+
+    @property
+    def name(self):
+        return os.path.basename(self.path)
+
+    @property
+    def icon(self):
+        return PROJECT_TYPES[self.type_id][0]
+
+    @property
+    def type(self):
+        return PROJECT_TYPES[self.type_id][1]
+
+# The index is shared by every window, the CLI and the daemon, so write transactions
+# are kept short and a write never waits long enough to look like a stalled root
+INDEX_BUSY_TIMEOUT = 2.0  # seconds a write waits for another process's transaction
+INDEX_COMMIT_INTERVAL = 0.5  # seconds a write transaction may stay open
+INDEX_RETRY_DELAY = 2.0  # seconds before writes deferred by a busy database are tried again
+
+def database_locked(error):
+    return "locked" in str(error) or "busy" in str(error)
+
+class ProjectIndex:
+    """Persistent SQLite cache of project scan results keyed by path and mtimes.
+
+    Runs in WAL mode, so readers never wait for a writer. Writes are committed at least
+    every INDEX_COMMIT_INTERVAL; while another process holds the write lock past
+    INDEX_BUSY_TIMEOUT they are queued and retried by the next commit.
+    """
+    SCHEMA_VERSION = 4
+
+    def __init__(self, db_path):
+        os.makedirs(os.path.dirname(db_path), exist_ok=True)
+        # Scan workers share one connection, serialized by the lock
+        self.lock = threading.Lock()
+        self.conn = sqlite3.connect(db_path, timeout=INDEX_BUSY_TIMEOUT, check_same_thread=False)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        # Durable at each checkpoint rather than each commit, so frequent commits stay cheap
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.opened = None  # when the open write transaction started
+        self.deferred = []  # (statement, parameters, many) waiting for the write lock
+        self.retry_at = 0.0
+        if self.conn.execute("PRAGMA user_version").fetchone()[0] != self.SCHEMA_VERSION:
+            self.conn.execute("DROP TABLE IF EXISTS projects")
+            self.conn.execute("DROP TABLE IF EXISTS git_status")
+            self.conn.execute(f"PRAGMA user_version = {self.SCHEMA_VERSION}")
+        self.conn.execute("""
+            CREATE TABLE IF NOT EXISTS projects (
+                path TEXT PRIMARY KEY,
+                dir_mtime INTEGER,
+                readme_path TEXT,
+                readme_mtime INTEGER,
+                package_mtime INTEGER,
+                manifest_mtimes TEXT,
+                is_valid INTEGER,
+                icon TEXT,
+                type TEXT,
+                title TEXT,
+                description TEXT,
+                scripts TEXT,
+                launch_kind TEXT,
+                launch_target TEXT,
+                package_name TEXT,
+                homepage TEXT
+            )
+        """)
+        # Launch history is not a cache, so it is kept when the schema version changes
+        self.conn.execute("""
+            CREATE TABLE IF NOT EXISTS activity (
+                path TEXT PRIMARY KEY,
+                sampled_dir_mtime INTEGER,
+                sampled_at REAL,
+                last_modified INTEGER,
+                last_launched INTEGER,
+                launch_count INTEGER NOT NULL DEFAULT 0
+            )
+        """)
+        # Cached types are only valid for the rules that detected them
+        self.conn.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT)")
+        fingerprint = ProjectTypeRules.get().fingerprint
+        row = self.conn.execute("SELECT value FROM meta WHERE key = 'type_rules'").fetchone()
+        if row is None or row['value'] != fingerprint:
+            self.conn.execute("DELETE FROM projects")
+            self.conn.execute("INSERT OR REPLACE INTO meta VALUES ('type_rules', ?)", (fingerprint,))
+        self.conn.execute("""
+            CREATE TABLE IF NOT EXISTS git_status (
+                path TEXT PRIMARY KEY,
+                head_mtime INTEGER,
+                index_mtime INTEGER,
+                branch TEXT,
+                dirty INTEGER,
+                ahead INTEGER,
+                behind INTEGER
+            )
+        """)
+        self.conn.commit()
+
+    def row_record(self, row):
+        return ProjectRecord(
+            row['path'], dir_mtime=row['dir_mtime'], is_valid=bool(row['is_valid']),
+            type_id=project_type_id(row['icon'], row['type']), readme_path=row['readme_path'],
+            readme_mtime=row['readme_mtime'], package_mtime=row['package_mtime'],
+            manifest_mtimes=json.loads(row['manifest_mtimes']) if row['manifest_mtimes'] else None,
+            title=row['title'], description=row['description'],
+            scripts=json.loads(row['scripts']) if row['scripts'] else None,
+            launch_kind=row['launch_kind'] and sys.intern(row['launch_kind']),
+            launch_target=row['launch_target'], package_name=row['package_name'],
+            homepage=row['homepage'])
+
+    def get(self, project_path):
+        """Return the cached record of a folder, or None (also while the database is busy)."""
+        with self.lock:
+            try:
+                row = self.conn.execute("SELECT * FROM projects WHERE path = ?",
+                                        (project_path,)).fetchone()
+            except sqlite3.OperationalError as e:
+                if not database_locked(e):
+                    raise
+                return None  # scanned afresh instead
+        if row is None:
+            return None
+        return self.row_record(row)
+
+    def records_under(self, base_dir):
+        """Return the cached records of every folder under base_dir (used while it is unreachable)."""
+        prefix = os.path.join(base_dir, "")
+        with self.lock:
+            rows = self.conn.execute("SELECT * FROM projects WHERE substr(path, 1, ?) = ?",
+                                     (len(prefix), prefix)).fetchall()
+        return [self.row_record(row) for row in rows]
+
+    def write(self, statement, parameters=(), many=False):
+        """Run a write statement with self.lock held, or queue it while the database is busy."""
+        if not self.deferred:
+            try:
+                if many:
+                    self.conn.executemany(statement, parameters)
+                else:
+                    self.conn.execute(statement, parameters)
+            except sqlite3.OperationalError as e:
+                if not database_locked(e):
+                    raise
+                self.retry_at = time.monotonic() + INDEX_RETRY_DELAY
+            else:
+                if self.opened is None:
+                    self.opened = time.monotonic()
+                elif time.monotonic() - self.opened >= INDEX_COMMIT_INTERVAL:
+                    self.flush()
+                return
+        self.deferred.append((statement, parameters, many))
+
+    def flush(self):
+        """Apply deferred writes (once their retry is due) and commit, with self.lock held."""
+        if self.deferred and time.monotonic() >= self.retry_at:
+            try:
+                while self.deferred:
+                    statement, parameters, many = self.deferred[0]
+                    if many:
+                        self.conn.executemany(statement, parameters)
+                    else:
+                        self.conn.execute(statement, parameters)
+                    self.deferred.pop(0)
+                    if self.opened is None:
+                        self.opened = time.monotonic()
+            except sqlite3.OperationalError as e:
+                if not database_locked(e):
+                    raise
+                self.retry_at = time.monotonic() + INDEX_RETRY_DELAY
+        try:
+            self.conn.commit()
+            self.opened = None
+        except sqlite3.OperationalError as e:
+            if not database_locked(e):
+                raise
+            self.retry_at = time.monotonic() + INDEX_RETRY_DELAY
+
+    def commit_if_due(self):
+        """Commit when the open transaction is INDEX_COMMIT_INTERVAL old or a retry is due."""
+        with self.lock:
+            now = time.monotonic()
+            if ((self.opened is not None and now - self.opened >= INDEX_COMMIT_INTERVAL)
+                    or (self.deferred and now >= self.retry_at)):
+                self.flush()
+
+    def put(self, record):
+        with self.lock:
+            self.write(
+                "INSERT OR REPLACE INTO projects VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (record.path, record.dir_mtime, record.readme_path, record.readme_mtime,
+                 record.package_mtime,
+                 json.dumps(record.manifest_mtimes) if record.manifest_mtimes else None,
+                 int(record.is_valid), record.icon, record.type,
+                 record.title, record.description,
+                 json.dumps(record.scripts) if record.scripts is not None else None,
+                 record.launch_kind, record.launch_target, record.package_name,
+                 record.homepage))
+
+    def prune(self, base_dir, seen_paths):
+        """Drop cached entries under base_dir not seen in the latest scan and return their paths.
+
+        Activity is only dropped for folders that are confirmed gone: a shallower scan
+        or a folder that failed to scan must not lose its launch history.
+        """
+        prefix = os.path.join(base_dir, "")
+        with self.lock:
+            rows = self.conn.execute("SELECT path FROM projects WHERE substr(path, 1, ?) = ?",
+                                     (len(prefix), prefix)).fetchall()
+            stale = [row['path'] for row in rows if row['path'] not in seen_paths]
+            for table in ('projects', 'git_status'):
+                self.write(f"DELETE FROM {table} WHERE path = ?",
+                           [(path,) for path in stale], many=True)
+            rows = self.conn.execute("SELECT path FROM activity WHERE substr(path, 1, ?) = ?",
+                                     (len(prefix), prefix)).fetchall()
+        tracked = {row['path'] for row in rows}
+        gone = [path for path in stale if path in tracked and folder_gone(path)]
+        if gone:
+            with self.lock:
+                self.write("DELETE FROM activity WHERE path = ?", [(path,) for path in gone],
+                           many=True)
+        return stale
+
+    def set_readme_info(self, project_path, title, description):
+        with self.lock:
+            self.write("UPDATE projects SET title = ?, description = ? WHERE path = ?",
+                       (title, description, project_path))
+
+    def remove(self, project_paths):
+        with self.lock:
+            for table in ('projects', 'git_status', 'activity'):
+                self.write(f"DELETE FROM {table} WHERE path = ?",
+                           [(path,) for path in project_paths], many=True)
+
+    def get_git_status(self, project_path, head_mtime, index_mtime):
+        """Return the stored GitStatus of a repository if its HEAD and index are unchanged."""
+        with self.lock:
+            row = self.conn.execute(
+                "SELECT * FROM git_status WHERE path = ? AND head_mtime = ? AND index_mtime IS ?",
+                (project_path, head_mtime, index_mtime)).fetchone()
+        if row is None:
+            return None
+        return GitStatus(row['branch'], None if row['dirty'] is None else bool(row['dirty']),
+                         row['ahead'], row['behind'])
+
+    def put_git_status(self, project_path, head_mtime, index_mtime, status):
+        with self.lock:
+            self.write(
+                "INSERT OR REPLACE INTO git_status VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (project_path, head_mtime, index_mtime, status.branch,
+                 None if status.dirty is None else int(status.dirty), status.ahead, status.behind))
+
+    def activity_row(self, row):
+        return ActivityStats(row['last_modified'], row['last_launched'], row['launch_count'])
+
+    def all_activity(self):
+        """Return the stored ActivityStats of every project by path (read once per load)."""
+        with self.lock:
+            rows = self.conn.execute("SELECT * FROM activity").fetchall()
+        return {row['path']: self.activity_row(row) for row in rows}
+
+    def get_activity(self, project_path):
+        """Return (ActivityStats, sampled_dir_mtime, sampled_at) of a project, or None."""
+        with self.lock:
+            row = self.conn.execute("SELECT * FROM activity WHERE path = ?",
+                                    (project_path,)).fetchone()
+        if row is None:
+            return None
+        return self.activity_row(row), row['sampled_dir_mtime'], row['sampled_at']
+
+    def put_activity_sample(self, project_path, dir_mtime, sampled_at, last_modified):
+        return self.update_activity(
+            project_path, """
+            INSERT INTO activity (path, sampled_dir_mtime, sampled_at, last_modified)
+            VALUES (?, ?, ?, ?)
+            ON CONFLICT(path) DO UPDATE SET sampled_dir_mtime = excluded.sampled_dir_mtime,
+                sampled_at = excluded.sampled_at, last_modified = excluded.last_modified
+            """, (project_path, dir_mtime, sampled_at, last_modified))
+
+    def record_launch(self, project_path, launched_at):
+        return self.update_activity(
+            project_path, """
+            INSERT INTO activity (path, last_launched, launch_count) VALUES (?, ?, 1)
+            ON CONFLICT(path) DO UPDATE SET last_launched = excluded.last_launched,
+                launch_count = launch_count + 1
+            """, (project_path, launched_at))
+
+    def update_activity(self, project_path, statement, parameters):
+        """Apply an activity upsert and return the project's ActivityStats after it.
+
+        While the upsert is deferred by a busy database the previous stats are returned.
+        """
+        with self.lock:
+            self.write(statement, parameters)
+            row = self.conn.execute("SELECT * FROM activity WHERE path = ?",
+                                    (project_path,)).fetchone()
+        return self.activity_row(row) if row is not None else ActivityStats()
+
+    def commit(self):
+        with self.lock:
+            self.flush()
+
+    def close(self):
+        """Commit (with deferred writes, if their retry is due) and close the connection."""
+        with self.lock:
+            self.flush()
+            self.conn.close()
+
+SNAPSHOT_VERSION = 2
+
+def encode_records(records):
+    """Return records as JSON-ready rows, for the grid snapshot and the index daemon."""
+    # One row per project in RECORD_FIELDS order; type ids refer to the sent type table
+    with project_types_lock:
+        types = list(PROJECT_TYPES)
+    return {'fields': RECORD_FIELDS, 'types': types,
+            'rows': [record.row() for record in records]}
+
+def decode_records(data):
+    """Return the records of encode_records() output, or None if the fields differ."""
+    if data.get('fields') != list(RECORD_FIELDS):
+        return None
+    # Type ids are per process, so map the sent ones onto this process's table
+    type_ids = [project_type_id(icon, project_type) for icon, project_type in data['types']]
+    type_field = RECORD_FIELDS.index('type_id')
+    records = []
+    for row in data['rows']:
+        row[type_field] = type_ids[row[type_field]]
+        records.append(ProjectRecord.from_row(row))
+    return records
+
+def save_grid_snapshot(snapshot_path, roots, max_depth, records):
+    """Write the shown projects, in display order, for the next start to paint straight away."""
+    data = {
+        'version': SNAPSHOT_VERSION,
+        'roots': list(roots),
+        'max_depth': max_depth,
+        **encode_records(records),
+    }
+    temp_path = snapshot_path + ".tmp"
+    try:
+        os.makedirs(os.path.dirname(snapshot_path), exist_ok=True)
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            json.dump(data, f, ensure_ascii=False, separators=(',', ':'))
+        # Replaced in one step so a crash never leaves half a snapshot
+        os.replace(temp_path, snapshot_path)
+    except OSError as e:
+        print(f"Error saving grid snapshot: {e}")
+
+def load_grid_snapshot(snapshot_path, roots, max_depth):
+    """Return the snapshot's records, or [] if it is missing or was taken with other settings."""
+    try:
+        with open(snapshot_path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return []
+    if (not isinstance(data, dict) or data.get('version') != SNAPSHOT_VERSION
+            or data.get('roots') != list(roots) or data.get('max_depth') != max_depth):
+        return []
+    return decode_records(data) or []
+
+def scan_project(project_path, index=None):
+    """Return the scan record for a project, reusing the index entry if its mtimes are unchanged.
+
+    Returns (record, snapshot); snapshot is the folder listing taken for a fresh scan, or
+    None when the record came from the index.
+    """
+    with profiler.project(project_path):
+        with profiler.phase("cache_check"):
+            dir_mtime = file_mtime(project_path)
+            cached = index.get(project_path) if index is not None else None
+            if (cached is not None and cached.dir_mtime == dir_mtime
+                    and file_mtime(cached.readme_path) == cached.readme_mtime
+                    and (cached.package_mtime is None
+                         or file_mtime(os.path.join(project_path, "package.json")) == cached.package_mtime)
+                    and all(file_mtime(os.path.join(project_path, name)) == mtime
+                            for name, mtime in (cached.manifest_mtimes or {}).items())):
+                return cached, None
+
+        with profiler.phase("probe"):
+            snapshot = DirectorySnapshot(project_path)
+        with profiler.phase("detect"):
+            record = ProjectRecord(project_path, dir_mtime=dir_mtime,
+                                   is_valid=is_valid_project(project_path, snapshot))
+            if record.is_valid:
+                manifest_mtimes = {}
+                record.type_id = project_type_id(
+                    *detect_project_type(project_path, snapshot, manifest_mtimes))
+                # package.json is checked through package_mtime
+                manifest_mtimes.pop("package.json", None)
+                record.manifest_mtimes = manifest_mtimes or None
+                record.launch_kind, record.launch_target = resolve_launch(project_path, snapshot)
+
+                readme = find_readme(snapshot)
+                if readme:
+                    record.readme_path = os.path.join(project_path, readme)
+                    record.readme_mtime = file_mtime(record.readme_path)
+                # README text is parsed later, on hover or by the background prefetch
+
+        if record.is_valid and "package.json" in snapshot.files:
+            with profiler.phase("package_json"):
+                package = read_package_info(project_path)
+                record.package_mtime = manifests.mtime(os.path.join(project_path, "package.json"))
+                record.package_name = package['name']
+                record.homepage = package['homepage']
+                record.scripts = package['scripts']
+
+        if index is not None:
+            with profiler.phase("index_write"):
+                index.put(record)
+        return record, snapshot
+
+def _subprocess_kwargs(**kwargs):
+    """Popen keyword arguments for a background tool, which must not open a console on Windows."""
+    if os.name == "nt":
+        kwargs.setdefault('creationflags', subprocess.CREATE_NO_WINDOW)
+    return kwargs
+
+def _npm_command(command):
+    """Popen arguments for a command that may run npm."""
+    # npm is a .cmd shim on Windows, which only the shell can run
+    return {'args': command, 'shell': os.name == "nt"}
+
+# git is optional: without it the branch is still read from .git/HEAD
+GIT_EXECUTABLE = shutil.which("git")
+GIT_TIMEOUT = 10.0  # seconds a single git status may take
+
+class GitStatus:
+    """Branch, uncommitted changes and commits ahead of/behind upstream of a repository.
+
+    dirty, ahead and behind are None when unknown (git missing, failed or no upstream).
+    """
+    __slots__ = ('branch', 'dirty', 'ahead', 'behind')
+
+    def __init__(self, branch, dirty=None, ahead=None, behind=None):
+        self.branch = branch
+        self.dirty = dirty
+        self.ahead = ahead
+        self.behind = behind
+
+    def summary(self):
+        """Short text for a card, e.g. "main* ↑2 ↓1"."""
+        text = (self.branch or "?") + ("*" if self.dirty else "")
+        if self.ahead:
+            text += f" ↑{self.ahead}"
+        if self.behind:
+            text += f" ↓{self.behind}"
+        return text
+
+def find_git_dir(project_path):
+    """Return a project's git directory, following a .git file (worktrees, submodules)."""
+    path = os.path.join(project_path, ".git")
+    profiler.count(syscalls=1)
+    if os.path.isdir(path):
+        return path
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            line = f.readline(README_MAX_LINE).strip()
+    except OSError:
+        return None
+    if not line.startswith("gitdir:"):
+        return None
+    return os.path.normpath(os.path.join(project_path, line[len("gitdir:"):].strip()))
+
+def read_git_head(git_dir):
+    """Return the checked-out branch, or the short commit id of a detached HEAD."""
+    try:
+        with open(os.path.join(git_dir, "HEAD"), 'r', encoding='utf-8') as f:
+            head = f.readline(README_MAX_LINE).strip()
+    except OSError:
+        return None
+    if head.startswith("ref:"):
+        ref = head[len("ref:"):].strip()
+        return ref[len("refs/heads/"):] if ref.startswith("refs/heads/") else ref
+    return head[:7] or None
+
+def read_git_status(project_path, git_dir):
+    """Read the branch from HEAD, then ask git for changed files and ahead/behind counts."""
+    status = GitStatus(read_git_head(git_dir))
+    if GIT_EXECUTABLE is None:
+        return status
+    try:
+        # --no-optional-locks keeps git from rewriting the index, which would
+        # change its mtime and invalidate the cached status
+        result = subprocess.run(
+            [GIT_EXECUTABLE, "--no-optional-locks", "status", "--porcelain=v2", "--branch"],
+            cwd=project_path, stdin=subprocess.DEVNULL, stdout=subprocess.PIPE,
+            **_subprocess_kwargs(stderr=subprocess.DEVNULL, timeout=GIT_TIMEOUT))
+    except (OSError, subprocess.SubprocessError) as e:
+        print(f"Error reading git status of {project_path}: {e}")
+        return status
+    if result.returncode != 0:
+        return status
+    status.dirty = False
+    for line in result.stdout.decode(errors='replace').splitlines():
+        if line.startswith("# branch.ab "):
+            ahead, behind = line.split()[2:4]
+            status.ahead, status.behind = int(ahead), -int(behind)
+        elif not line.startswith("#"):
+            status.dirty = True
+    return status
+
+class GitStatusCache:
+    """Git status per project, recomputed only when .git/HEAD or .git/index changes.
+
+    Results are kept in memory and in the project index, so neither a refresh nor the
+    next start spawns git for an unchanged repository.
+    """
+
+    def __init__(self, index=None):
+        self.index = index
+        self.entries = {}  # project path -> ((head_mtime, index_mtime), GitStatus)
+        self.lock = threading.Lock()
+
+    def get(self, project_path):
+        """Return the GitStatus of a project, or None if it is not a git repository."""
+        git_dir = find_git_dir(project_path)
+        if git_dir is None:
+            return None
+        key = (file_mtime(os.path.join(git_dir, "HEAD")), file_mtime(os.path.join(git_dir, "index")))
+        if key[0] is None:
+            return None
+        with self.lock:
+            entry = self.entries.get(project_path)
+        if entry is not None and entry[0] == key:
+            return entry[1]
+
+        status = self.index.get_git_status(project_path, *key) if self.index is not None else None
+        if status is None:
+            with profiler.project(project_path), profiler.phase("git_status"):
+                status = read_git_status(project_path, git_dir)
+            if self.index is not None:
+                self.index.put_git_status(project_path, *key, status)
+        with self.lock:
+            self.entries[project_path] = (key, status)
+        return status
+
+    def forget(self, project_paths):
+        with self.lock:
+            for path in project_paths:
+                self.entries.pop(path, None)
+
+    def clear(self):
+        with self.lock:
+            self.entries = {}
+
+# Activity sampling: how much of a project is looked at to find its latest change
+ACTIVITY_SAMPLE_ENTRIES = 256  # directory entries stat'ed per project
+ACTIVITY_SAMPLE_DEPTH = 3
+ACTIVITY_RESAMPLE_AGE = 3600.0  # seconds before an unchanged project folder is sampled again
+SORT_MODES = ('recent', 'frequent', 'name')
+
+class ActivityStats:
+    """When a project was last modified and last launched (ns), and how often it was launched."""
+    __slots__ = ('last_modified', 'last_launched', 'launch_count')
+
+    def __init__(self, last_modified=None, last_launched=None, launch_count=0):
+        self.last_modified = last_modified
+        self.last_launched = last_launched
+        self.launch_count = launch_count
+
+    def recency(self):
+        return max(self.last_modified or 0, self.last_launched or 0)
+
+def sample_last_modified(project_path, max_entries=ACTIVITY_SAMPLE_ENTRIES,
+                         max_depth=ACTIVITY_SAMPLE_DEPTH):
+    """Return the newest mtime among the first max_entries entries of a breadth-first walk.
+
+    Heavy, generated and hidden folders are not entered, so the sample is spent on the
+    files people edit and its cost is bounded however big the project is.
+    """
+    latest = file_mtime(project_path)
+    pending = deque([(project_path, 0)])
+    seen = 0
+    while pending and seen < max_entries:
+        path, depth = pending.popleft()
+        try:
+            with os.scandir(path) as entries:
+                for entry in entries:
+                    if seen >= max_entries:
+                        break
+                    seen += 1
+                    try:
+                        mtime = entry.stat(follow_symlinks=False).st_mtime_ns
+                        is_dir = entry.is_dir(follow_symlinks=False)
+                    except OSError:
+                        continue
+                    latest = mtime if latest is None else max(latest, mtime)
+                    if (is_dir and depth < max_depth and entry.name not in SKIP_DIRS
+                            and not entry.name.startswith('.')):
+                        pending.append((entry.path, depth + 1))
+        except OSError:
+            continue
+    profiler.count(syscalls=seen)
+    return latest
+
+class ActivityTracker:
+    """Activity stats per project, kept in the project index.
+
+    A project is sampled again only once its folder mtime changes or its last sample is
+    older than resample_age, so a background pass over an unchanged tree only reads the
+    index.
+    """
+
+    def __init__(self, index, resample_age=ACTIVITY_RESAMPLE_AGE):
+        self.index = index
+        self.resample_age = resample_age
+
+    def get(self, record):
+        now = time.time()
+        entry = self.index.get_activity(record.path)
+        if entry is not None and entry[1] == record.dir_mtime and now - entry[2] < self.resample_age:
+            return entry[0]
+        with profiler.project(record.path), profiler.phase("activity"):
+            last_modified = sample_last_modified(record.path)
+        return self.index.put_activity_sample(record.path, record.dir_mtime, now, last_modified)
+
+    def record_launch(self, project_path):
+        stats = self.index.record_launch(project_path, time.time_ns())
+        self.index.commit()
+        return stats
+
+def activity_sort_key(mode, activity):
+    """Return a record sort key for a SORT_MODES mode, given ActivityStats by path.
+
+    recent puts the latest modified or launched projects first, frequent the most
+    launched; ties and name order go by name.
+    """
+    unknown = ActivityStats()
+    if mode == 'recent':
+        return lambda record: (-activity.get(record.path, unknown).recency(), record.name.lower())
+    if mode == 'frequent':
+        def frequent(record):
+            stats = activity.get(record.path, unknown)
+            return (-stats.launch_count, -stats.recency(), record.name.lower())
+        return frequent
+    return lambda record: record.name.lower()
+
+# Folders never descended into while looking for nested projects
+SKIP_DIRS = frozenset([
+    'node_modules', '.git', '.hg', '.svn', 'venv', '.venv', '__pycache__',
+    'target', 'dist', 'build', '.tox', '.mypy_cache', '.pytest_cache', '.next'
+])
+
+# Depth 1 only looks at the immediate children of each root
+DEFAULT_SCAN_DEPTH = 3
+
+def parse_roots(value):
+    """Split the projects_directory setting into its roots (separated by os.pathsep)."""
+    if isinstance(value, (list, tuple)):
+        return [root for root in value if root]
+    return [root.strip() for root in str(value or "").split(os.pathsep) if root.strip()]
+
+def list_project_dirs(base_dir):
+    """Return the paths of the sub-directories of base_dir worth scanning."""
+    with profiler.phase("list_root"):
+        with os.scandir(base_dir) as entries:
+            return [entry.path for entry in entries
+                    if entry.name not in SKIP_DIRS and entry.is_dir()]
+
+def visit_project_dir(project_path, depth, index, max_depth):
+    """Scan one folder; return its record and the child folders to descend into."""
+    record, snapshot = scan_project(project_path, index)
+    record.depth = depth
+    if record.is_valid or depth >= max_depth:
+        return record, []
+    # Not a project: it may be a group folder such as clients/<name>. Only an index hit
+    # lists it here; a fresh scan already did.
+    if snapshot is None:
+        snapshot = DirectorySnapshot(project_path)
+    children = [os.path.join(project_path, name) for name in snapshot.dirs
+                if name not in SKIP_DIRS]
+    return record, children
+
+# Seconds a root may go without answering before it is marked as degraded
+PROBE_TIMEOUT = 5.0
+
+class ProbeTimeout(OSError):
+    """A filesystem call did not return within its timeout (e.g. a stalled network mount)."""
+
+class DaemonExecutor:
+    """Minimal thread pool on daemon threads, so a call stuck on a dead mount never blocks exit."""
+
+    def __init__(self, max_workers):
+        self.max_workers = max_workers
+        self.tasks = queue.SimpleQueue()
+        self.threads = []
+
+    def submit(self, function, *args):
+        future = Future()
+        self.tasks.put((future, function, args))
+        if len(self.threads) < self.max_workers:
+            thread = threading.Thread(target=self.work, daemon=True)
+            thread.start()
+            self.threads.append(thread)
+        return future
+
+    def work(self):
+        while True:
+            task = self.tasks.get()
+            if task is None:
+                return
+            future, function, args = task
+            if not future.set_running_or_notify_cancel():
+                continue
+            try:
+                future.set_result(function(*args))
+            except BaseException as e:
+                future.set_exception(e)
+
+    def shutdown(self):
+        """Stop idle threads; threads stuck in a call are abandoned."""
+        for _ in self.threads:
+            self.tasks.put(None)
+
+def call_with_timeout(function, *args, timeout=PROBE_TIMEOUT):
+    """Run function on a daemon thread, raising ProbeTimeout if it does not return in time."""
+    executor = DaemonExecutor(1)
+    future = executor.submit(function, *args)
+    executor.shutdown()
+    done, _ = wait([future], timeout=timeout)
+    if not done:
+        raise ProbeTimeout(f"no response after {timeout:g}s")
+    return future.result()
+
+def root_exists(root, timeout=PROBE_TIMEOUT):
+    """os.path.isdir() that counts a root too slow to answer as present (its scan then degrades)."""
+    try:
+        return call_with_timeout(os.path.isdir, root, timeout=timeout)
+    except ProbeTimeout:
+        return True
+
+def folder_gone(path):
+    """True only if path no longer exists; a folder that cannot be read is not gone."""
+    try:
+        os.stat(path)
+    except (FileNotFoundError, NotADirectoryError):
+        return True
+    except OSError:
+        pass
+    return False
+
+def root_of(path, depth):
+    """Return the root a folder found depth levels below it belongs to."""
+    for _ in range(depth):
+        path = os.path.dirname(path)
+    return path
+
+class ProjectDiscovery:
+    """Walk several roots concurrently, stopping at project folders and skipping heavy ones.
+
+    Iterating yields the record of every folder visited (projects and non-projects).
+    starts holds (path, depth) pairs: depth 0 marks a root, which is only listed.
+    Each root has its own threads, so a root that stops answering for probe_timeout
+    seconds is marked as failed (its cached records are yielded instead) without
+    holding up the others. A folder that exists but fails to scan keeps its cached
+    records too, so a passing error never looks like a removed project.
+    """
+
+    def __init__(self, starts, index=None, max_depth=DEFAULT_SCAN_DEPTH, max_workers=8,
+                 cancelled=None, probe_timeout=PROBE_TIMEOUT):
+        self.starts = starts
+        self.index = index
+        self.max_depth = max_depth
+        self.max_workers = max_workers
+        self.cancelled = cancelled
+        self.probe_timeout = probe_timeout
+        self.done = 0
+        self.pending = 0
+        self.seen_paths = set()
+        self.listed_roots = []
+        self.failed_roots = {}  # root -> error message
+
+    def cached_records(self, root, folder=None):
+        """Last known records under a root that could not be walked, or of one of its
+        folders and everything below it."""
+        if self.index is None:
+            return []
+        candidates = self.index.records_under(folder or root)
+        if folder is not None:
+            candidates.append(self.index.get(folder))
+        records = []
+        for record in candidates:
+            if record is not None and record.path not in self.seen_paths:
+                relative = os.path.relpath(record.path, root)
+                record.depth = relative.count(os.sep) + 1
+                record.cached = True
+                self.seen_paths.add(record.path)
+                records.append(record)
+        return records
+
+    def __iter__(self):
+        return (record for record in self.walk() if record is not None)
+
+    def batches(self, size, interval):
+        """Yield lists of records, flushed every size records or interval seconds (even while idle)."""
+        batch = []
+        last_emit = time.monotonic()
+        for record in self.walk(min(interval, 0.5)):
+            if record is not None:
+                batch.append(record)
+            now = time.monotonic()
+            if batch and (len(batch) >= size or now - last_emit >= interval):
+                yield batch
+                batch = []
+                last_emit = now
+        if batch:
+            yield batch
+
+    def walk(self, tick=0.5):
+        """Yield records as they are found, and None every tick seconds spent waiting."""
+        executors = {}
+        last_answer = {}  # root -> when one of its probes last returned
+        pending = {}  # future -> (path, depth, root)
+
+        def submit(path, depth, root):
+            if root not in executors:
+                executors[root] = DaemonExecutor(self.max_workers)
+                last_answer[root] = time.monotonic()
+            if depth == 0:
+                future = executors[root].submit(list_project_dirs, path)
+            else:
+                future = executors[root].submit(visit_project_dir, path, depth, self.index,
+                                                self.max_depth)
+            pending[future] = (path, depth, root)
+
+        def fail(root, message):
+            # Abandon the root's outstanding probes; stuck threads are daemons
+            for future, (path, depth, owner) in list(pending.items()):
+                if owner == root:
+                    future.cancel()
+                    del pending[future]
+            executors[root].shutdown()
+            self.failed_roots[root] = message
+            return self.cached_records(root)
+
+        try:
+            for path, depth in self.starts:
+                submit(path, depth, root_of(path, depth))
+
+            while pending:
+                finished, _ = wait(pending, timeout=min(self.probe_timeout, tick),
+                                   return_when=FIRST_COMPLETED)
+                if self.cancelled is not None and self.cancelled.is_set():
+                    for future in pending:
+                        future.cancel()
+                    return
+                for future in finished:
+                    if future not in pending:
+                        continue  # its root failed earlier in this batch
+                    path, depth, root = pending.pop(future)
+                    last_answer[root] = time.monotonic()
+                    try:
+                        result = future.result()
+                    except (FileNotFoundError, NotADirectoryError) as e:
+                        if depth == 0:
+                            yield from fail(root, e.strerror or str(e))
+                        continue  # removed since its parent was listed
+                    except Exception as e:
+                        if depth == 0 and isinstance(e, OSError):
+                            yield from fail(root, e.strerror or str(e))
+                            continue
+                        print(f"Error scanning {path}: {e}")
+                        if depth:
+                            yield from self.cached_records(root, path)
+                        continue
+
+                    if depth == 0:
+                        self.listed_roots.append(path)
+                        children = result
+                    else:
+                        record, children = result
+                        self.seen_paths.add(path)
+                    for child in children:
+                        submit(child, depth + 1, root)
+                    if depth:
+                        self.done += 1
+                        yield record
+
+                # A root whose probes have all stopped answering is degraded
+                now = time.monotonic()
+                waiting = {root for path, depth, root in pending.values()}
+                for root in waiting:
+                    if now - last_answer[root] > self.probe_timeout:
+                        yield from fail(root, f"no response after {self.probe_timeout:g}s")
+                self.pending = len(pending)
+                if self.index is not None:
+                    self.index.commit_if_due()
+                if not finished:
+                    yield None
+        finally:
+            for executor in executors.values():
+                executor.shutdown()
+
+WORD_RE = re.compile(r'[a-z0-9]+')
+
+def trigrams(text):
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+class Postings(dict):
+    """key -> set of ids, with a lazily sorted key list for prefix lookups.
+
+    With short_prefixes, the ids under every 1- and 2-character key prefix are kept too,
+    since those prefixes can cover thousands of keys (e.g. numbered folder names).
+    """
+
+    def __init__(self, short_prefixes=False):
+        super().__init__()
+        self.sorted_keys = []
+        self.dirty = False
+        self.short = {} if short_prefixes else None  # prefix -> {id: keys under it}
+
+    def add(self, key, project_id):
+        ids = self.get(key)
+        if ids is None:
+            ids = self[key] = set()
+            self.dirty = True
+        ids.add(project_id)
+        if self.short is not None:
+            for prefix in {key[:1], key[:2]}:
+                counts = self.short.setdefault(prefix, {})
+                counts[project_id] = counts.get(project_id, 0) + 1
+
+    def discard(self, key, project_id):
+        ids = self[key]
+        ids.discard(project_id)
+        if not ids:
+            del self[key]
+            self.dirty = True
+        if self.short is not None:
+            for prefix in {key[:1], key[:2]}:
+                counts = self.short[prefix]
+                counts[project_id] -= 1
+                if not counts[project_id]:
+                    del counts[project_id]
+
+    def with_prefix(self, prefix):
+        """Union of the ids of every key starting with prefix."""
+        if self.short is not None and len(prefix) <= 2:
+            return set(self.short.get(prefix, ()))
+        if self.dirty:
+            self.sorted_keys = sorted(self)
+            self.dirty = False
+        start = bisect.bisect_left(self.sorted_keys, prefix)
+        end = bisect.bisect_left(self.sorted_keys, prefix + '\uffff', start)
+        return set().union(*(self[key] for key in self.sorted_keys[start:end]))
+
+    def containing(self, term, texts=None, known=frozenset()):
+        """Ids whose trigram-indexed text contains term (terms of 3+ characters).
+
+        Candidates outside known are checked against texts, since trigrams can all
+        match without the whole term being there.
+        """
+        keys = trigrams(term)
+        if len(term) < 3 or any(key not in self for key in keys):
+            return set()
+        ids = set.intersection(*(self[key] for key in keys))
+        if len(term) > 3 and texts is not None:
+            ids = known.intersection(ids).union(
+                project_id for project_id in ids.difference(known) if term in texts[project_id])
+        return ids
+
+class ProjectSearchIndex:
+    """In-memory index for the search box over names, README titles/descriptions and type labels.
+
+    Names, titles and types are indexed by trigram (substring search); every field is also
+    indexed by word so short terms and description words match by prefix. search() ranks
+    names with a word starting with the query first, then names containing it, then matches
+    in the other fields, then fuzzy (in-order letters) name matches; ties keep insertion order.
+    """
+
+    def __init__(self):
+        self.ids = {}  # path -> id, ids grow in insertion order
+        self.paths = []  # id -> path (None once removed)
+        self.names = []  # id -> lowercased name (None once removed)
+        self.name_lines = None  # names joined one per line for fuzzy matching, built lazily
+        self.term_cache = {}  # term -> match sets, valid until the index changes
+        self.entries = {}  # id -> keys posted, so an update can retract them
+        self.name_trigrams = Postings()
+        self.text_trigrams = Postings()  # title and type
+        self.name_words = Postings(short_prefixes=True)
+        self.words = Postings(short_prefixes=True)  # every field, descriptions included
+
+    def __len__(self):
+        return len(self.ids)
+
+    def postings(self):
+        return (self.name_trigrams, self.text_trigrams, self.name_words, self.words)
+
+    def add(self, record):
+        """Index a record, replacing what was indexed for the same path before."""
+        path = record.path
+        project_id = self.ids.get(path)
+        if project_id is None:
+            project_id = len(self.paths)
+            self.ids[path] = project_id
+            self.paths.append(path)
+            self.names.append(None)
+        else:
+            self.retract(project_id)
+
+        name = record.name.lower()
+        texts = [(record.title or '').lower(), (record.type or '').lower()]
+        # Projects without a README get a placeholder description that is not worth matching
+        description = (record.description or '').lower() if record.readme_path else ''
+        name_words = set(WORD_RE.findall(name))
+        words = name_words.union(WORD_RE.findall(description), *(WORD_RE.findall(text) for text in texts))
+        entry = (trigrams(name), set().union(*(trigrams(text) for text in texts)), name_words, words)
+        for postings, keys in zip(self.postings(), entry):
+            for key in keys:
+                postings.add(key, project_id)
+        self.names[project_id] = name
+        self.entries[project_id] = entry
+        self.name_lines = None
+        self.term_cache = {}
+
+    def remove(self, path):
+        project_id = self.ids.pop(path, None)
+        if project_id is not None:
+            self.retract(project_id)
+            self.paths[project_id] = self.names[project_id] = None
+            del self.entries[project_id]
+            self.name_lines = None
+            self.term_cache = {}
+
+    def retract(self, project_id):
+        for postings, keys in zip(self.postings(), self.entries[project_id]):
+            for key in keys:
+                postings.discard(key, project_id)
+
+    def search(self, query):
+        """Return the matching paths, best first, or None for a blank query."""
+        terms = WORD_RE.findall(query.lower())
+        if not terms:
+            return None
+
+        name_prefix = name_match = matched = None
+        for term in terms:
+            prefix, in_name, anywhere = self.match_term(term)
+            if matched is None:
+                name_prefix, name_match, matched = prefix, in_name, anywhere
+            else:
+                name_prefix &= prefix
+                name_match &= in_name
+                matched &= anywhere
+
+        ranked = sorted(name_prefix)
+        ranked += sorted(name_match - name_prefix)
+        ranked += sorted(matched - name_match)
+        if not ranked:
+            ranked = self.fuzzy_ids(''.join(terms))
+        return list(map(self.paths.__getitem__, ranked))
+
+    def match_term(self, term):
+        """Ids whose name has a word starting with term, whose name contains it, and that match anywhere."""
+        sets = self.term_cache.get(term)
+        if sets is None:
+            # Cached so typing more terms does not recompute the earlier ones
+            prefix = self.name_words.with_prefix(term)
+            in_name = prefix | self.name_trigrams.containing(term, self.names, prefix)
+            anywhere = in_name | self.words.with_prefix(term) | self.text_trigrams.containing(term)
+            sets = self.term_cache[term] = (prefix, in_name, anywhere)
+            if len(self.term_cache) > 64:
+                del self.term_cache[next(iter(self.term_cache))]
+        return sets
+
+    def fuzzy_ids(self, letters):
+        """Ids of names containing letters in order, e.g. "pm" for "project-menu"."""
+        if self.name_lines is None:
+            self.name_lines = "\n".join(name or "" for name in self.names)
+            self.line_starts = [0]
+            for name in self.names[:-1]:
+                self.line_starts.append(self.line_starts[-1] + len(name or "") + 1)
+        # [^x]*x segments never backtrack, and the leading literal lets the scan skip
+        # straight to candidate letters, so one pass over all names stays fast
+        first = re.escape(letters[0])
+        pattern = first + ''.join(f'[^\\n{re.escape(char)}]*{re.escape(char)}' for char in letters[1:])
+        ids = []
+        for match in re.finditer(pattern, self.name_lines):
+            project_id = bisect.bisect_right(self.line_starts, match.start()) - 1
+            if (not ids or ids[-1] != project_id) and self.names[project_id] is not None:
+                ids.append(project_id)
+        return ids
+
+# Common Python entry points, in order of preference
+PYTHON_ENTRY_FILES = ("main.py", "app.py", "run.py", "start.py")
+
+def find_main_python_file(project_path, snapshot=None):
+    if snapshot is None:
+        snapshot = DirectorySnapshot(project_path)
+    
+    # Look for common Python entry points
+    for name in PYTHON_ENTRY_FILES:
+        if name in snapshot.names:
+            return name
+    
+    # If no common name found, look for any Python file
+    for file in sorted(snapshot.files):
+        if file.endswith(".py"):
+            return file
+    return None
+
+def resolve_launch(project_path, snapshot=None):
+    """Return ('npm', None), ('python', main_file) or (None, None) for a project."""
+    if snapshot is None:
+        snapshot = DirectorySnapshot(project_path)
+    if "package.json" in snapshot.names:
+        return 'npm', None
+    main_py = find_main_python_file(project_path, snapshot)
+    if main_py:
+        return 'python', main_py
+    return None, None
+
+# Where a project's own interpreter is looked for, in order
+VENV_DIRS = ('.venv', 'venv', 'env')
+# Lockfiles and the package manager that writes them, in order of precedence
+NODE_LOCKFILES = (('package-lock.json', 'npm'), ('yarn.lock', 'yarn'), ('pnpm-lock.yaml', 'pnpm'))
+# Files npm, yarn and pnpm rewrite in node_modules after every install
+NODE_INSTALL_MARKERS = ('.package-lock.json', '.yarn-integrity', '.modules.yaml')
+# poetry is optional: without it only in-project virtualenvs are found
+POETRY_EXECUTABLE = shutil.which("poetry")
+POETRY_TIMEOUT = 10.0  # seconds "poetry env info" may take
+INSTALL_TIMEOUT = 1800.0  # seconds a dependency install may take
+
+class ProjectEnvironment:
+    """The interpreter a project runs with and whether its dependencies are installed.
+
+    ready is None when there is nothing to check, otherwise whether the installed
+    dependencies are at least as new as the declared ones. install holds the commands
+    that bring them up to date.
+    """
+    __slots__ = ('interpreter', 'ready', 'detail', 'install')
+
+    def __init__(self, interpreter=None, ready=None, detail=None, install=()):
+        self.interpreter = interpreter
+        self.ready = ready
+        self.detail = detail
+        self.install = install
+
+    def install_text(self):
+        """The install commands as one line to show, e.g. creating a venv && installing into it."""
+        return " && ".join(" ".join(command) for command in self.install)
+
+    def install_command(self):
+        """The install commands as one command that runs them in order, stopping at the first failure."""
+        if len(self.install) == 1:
+            return list(self.install[0])
+        if os.name == "nt":
+            # Runs through cmd.exe (see _npm_command), which leaves the && separators unquoted
+            chained = []
+            for command in self.install:
+                chained += ["&&", *command] if chained else command
+            return chained
+        return ["sh", "-c", " && ".join(shlex.join(command) for command in self.install)]
+
+def venv_python(venv_dir):
+    if os.name == "nt":
+        return os.path.join(venv_dir, "Scripts", "python.exe")
+    return os.path.join(venv_dir, "bin", "python")
+
+def venv_site_packages(venv_dir):
+    if os.name == "nt":
+        return os.path.join(venv_dir, "Lib", "site-packages")
+    lib = os.path.join(venv_dir, "lib")
+    profiler.count(syscalls=1)
+    try:
+        versions = sorted(name for name in os.listdir(lib) if name.startswith("python"))
+    except OSError:
+        return None
+    return os.path.join(lib, versions[-1], "site-packages") if versions else None
+
+class EnvironmentResolver:
+    """Resolve a project's interpreter and dependency readiness from a handful of stats.
+
+    Only a poetry project without an in-project virtualenv spawns a process; its
+    answer is kept until pyproject.toml changes.
+    """
+
+    def __init__(self):
+        self.poetry_venvs = {}  # project path -> (pyproject mtime, venv dir or None)
+        self.lock = threading.Lock()
+
+    def resolve(self, record, run_tools=True):
+        """Return the ProjectEnvironment of a record, or None if it cannot be launched.
+
+        With run_tools False nothing is spawned, so it is safe on the GUI thread.
+        """
+        with profiler.project(record.path), profiler.phase("environment"):
+            if record.launch_kind == 'npm':
+                return self.node_environment(record.path)
+            if record.launch_kind == 'python':
+                return self.python_environment(record.path, run_tools)
+        return None
+
+    def node_environment(self, project_path):
+        manager, declared, declared_by = 'npm', None, "package.json"
+        for lockfile, name in NODE_LOCKFILES:
+            declared = file_mtime(os.path.join(project_path, lockfile))
+            if declared is not None:
+                manager, declared_by = name, lockfile
+                break
+        else:
+            declared = file_mtime(os.path.join(project_path, "package.json"))
+        install = ([manager, "install"],)
+
+        modules = os.path.join(project_path, "node_modules")
+        markers = [file_mtime(os.path.join(modules, marker)) for marker in NODE_INSTALL_MARKERS]
+        installed = max((mtime for mtime in markers if mtime is not None), default=None)
+        if installed is None:
+            installed = file_mtime(modules)
+        if installed is None:
+            return ProjectEnvironment(None, False, "node_modules is missing", install)
+        if declared is not None and installed < declared:
+            return ProjectEnvironment(None, False, f"node_modules is older than {declared_by}",
+                                      install)
+        return ProjectEnvironment(None, True, "node_modules is up to date", install)
+
+    def python_environment(self, project_path, run_tools=True):
+        venv = self.find_venv(project_path, run_tools)
+        declared = file_mtime(os.path.join(project_path, "requirements.txt"))
+        if venv is None:
+            if declared is None:
+                return ProjectEnvironment(None, None, "Runs with the system Python")
+            venv = os.path.join(project_path, ".venv")
+            return ProjectEnvironment(None, False, "No virtualenv for requirements.txt", (
+                ["python", "-m", "venv", venv],
+                [venv_python(venv), "-m", "pip", "install", "-r", "requirements.txt"]))
+
+        interpreter = venv_python(venv)
+        if declared is None:
+            return ProjectEnvironment(interpreter, None, f"Runs with {os.path.basename(venv)}")
+        install = ([interpreter, "-m", "pip", "install", "-r", "requirements.txt"],)
+        installed = file_mtime(venv_site_packages(venv))
+        if installed is None or installed < declared:
+            return ProjectEnvironment(interpreter, False,
+                                      f"requirements.txt changed since "
+                                      f"{os.path.basename(venv)} was installed",
+                                      install)
+        return ProjectEnvironment(interpreter, True, f"Runs with {os.path.basename(venv)}",
+                                  install)
+
+    def find_venv(self, project_path, run_tools=True):
+        """Return the virtualenv folder of a project, or None to use the system Python."""
+        for name in VENV_DIRS:
+            venv = os.path.join(project_path, name)
+            if file_mtime(venv_python(venv)) is not None:
+                return venv
+        pyproject = os.path.join(project_path, "pyproject.toml")
+        mtime = file_mtime(pyproject)
+        if mtime is None or POETRY_EXECUTABLE is None:
+            return None
+        with self.lock:
+            entry = self.poetry_venvs.get(project_path)
+        if entry is not None and entry[0] == mtime:
+            return entry[1]
+        if not run_tools:
+            return None
+        venv = read_poetry_venv(project_path, pyproject)
+        with self.lock:
+            self.poetry_venvs[project_path] = (mtime, venv)
+        return venv
+
+def read_poetry_venv(project_path, pyproject):
+    """Ask poetry for the virtualenv of a poetry project kept outside the project folder."""
+    try:
+        with open(pyproject, 'r', encoding='utf-8') as f:
+            if "[tool.poetry" not in f.read(README_MAX_SCAN):
+                return None
+    except (OSError, UnicodeDecodeError):
+        return None
+    try:
+        result = subprocess.run([POETRY_EXECUTABLE, "env", "info", "--path"], cwd=project_path,
+                                stdin=subprocess.DEVNULL, stdout=subprocess.PIPE,
+                                **_subprocess_kwargs(stderr=subprocess.DEVNULL,
+                                                     timeout=POETRY_TIMEOUT))
+    except (OSError, subprocess.SubprocessError) as e:
+        print(f"Error reading poetry environment of {project_path}: {e}")
+        return None
+    venv = result.stdout.decode(errors='replace').strip()
+    if result.returncode != 0 or not venv or file_mtime(venv_python(venv)) is None:
+        return None
+    return venv
+
+def run_install(environment, project_path, cancelled=None):
+    """Run an environment's install commands in order; return True if all of them succeeded.
+
+    Setting the cancelled event kills the running command.
+    """
+    for command in environment.install:
+        try:
+            process = subprocess.Popen(**_npm_command(command), cwd=project_path,
+                                       stdin=subprocess.DEVNULL, stdout=subprocess.DEVNULL,
+                                       **_subprocess_kwargs(stderr=subprocess.DEVNULL))
+        except OSError as e:
+            print(f"Error installing dependencies of {project_path}: {e}")
+            return False
+        deadline = time.monotonic() + INSTALL_TIMEOUT
+        while True:
+            try:
+                returncode = process.wait(0.5)
+                break
+            except subprocess.TimeoutExpired:
+                if (cancelled is not None and cancelled.is_set()) or time.monotonic() > deadline:
+                    process.kill()
+                    process.wait()
+                    return False
+        if returncode != 0:
+            print(f"Error installing dependencies of {project_path}: "
+                  f"{' '.join(command)} exited with {returncode}")
+            return False
+    return True
+
+def launch_command(record, script=None, environment=None):
+    """Return the command of a record's launch plan, or None (npm projects need a script).
+
+    Python projects run with the interpreter of their resolved environment, if any.
+    """
+    if record.launch_kind == 'npm':
+        return ["npm", "run", script] if script else None
+    if record.launch_kind == 'python':
+        interpreter = environment.interpreter if environment is not None else None
+        return [interpreter or "python", record.launch_target]
+    return None
+
+def start_process(command, cwd):
+    """Start a launch command detached from the menu."""
+    return subprocess.Popen(**_npm_command(command), cwd=cwd)
+
+# Output kept per launched process; older lines are dropped
+OUTPUT_LINES = 2000
+OUTPUT_LINE_BYTES = 4096
+
+class ManagedProcess:
+    """A launched project whose stdout and stderr are drained into a bounded ring buffer.
+
+    Reader threads keep the pipes empty so the child never blocks on a full pipe;
+    viewers poll lines() for what was added since their last look.
+    """
+
+    def __init__(self, command, cwd):
+        self.command = command
+        self.cwd = cwd
+        self.output = deque(maxlen=OUTPUT_LINES)  # (stream name, line)
+        self.total_lines = 0  # lines ever appended, including dropped ones
+        self.lock = threading.Lock()
+        self.popen = None
+        self.starting = False  # set by a restart until the previous process has stopped
+        self.cancelled = False  # stop() ran first, so a pending restart must not start
+        self.state_lock = threading.Lock()
+
+    def start(self):
+        kwargs = {}
+        if os.name == "nt":
+            kwargs['creationflags'] = subprocess.CREATE_NEW_PROCESS_GROUP
+        else:
+            kwargs['start_new_session'] = True  # so stop() reaches the whole process group
+        self.popen = subprocess.Popen(**_npm_command(self.command), cwd=self.cwd,
+                                      stdin=subprocess.DEVNULL, stdout=subprocess.PIPE,
+                                      stderr=subprocess.PIPE, **kwargs)
+        for name, stream in (('stdout', self.popen.stdout), ('stderr', self.popen.stderr)):
+            threading.Thread(target=self.drain, args=(name, stream), daemon=True).start()
+
+    def drain(self, name, stream):
+        with stream:
+            # readline(limit) splits overlong lines instead of buffering them whole
+            for chunk in iter(lambda: stream.readline(OUTPUT_LINE_BYTES), b''):
+                line = chunk.decode(errors='replace').rstrip('\r\n')
+                self.append(name, line)
+
+    def append(self, name, line):
+        with self.lock:
+            self.output.append((name, line))
+            self.total_lines += 1
+
+    def lines(self, since=0):
+        """Return (total_lines, lines added after the first since); may start with a gap."""
+        with self.lock:
+            new = min(self.total_lines - since, len(self.output))
+            return self.total_lines, list(self.output)[len(self.output) - new:]
+
+    def start_after(self, previous):
+        """Stop the previous process, then start this one unless it was stopped meanwhile."""
+        previous.stop()
+        with self.state_lock:
+            try:
+                if not self.cancelled:
+                    self.start()
+            except OSError as e:
+                self.append('stderr', f"Failed to start: {e}")
+            finally:
+                self.starting = False
+
+    @property
+    def running(self):
+        return self.popen is not None and self.popen.poll() is None
+
+    @property
+    def busy(self):
+        """Running, or about to run once a restart has stopped its predecessor."""
+        return self.starting or self.running
+
+    @property
+    def returncode(self):
+        return self.popen.poll() if self.popen is not None else None
+
+    def stop(self, timeout=5.0):
+        """Terminate the process and its children, killing them if they outlive timeout."""
+        with self.state_lock:
+            self.cancelled = True
+        if not self.running:
+            return
+        try:
+            if os.name == "nt":
+                subprocess.run(["taskkill", "/T", "/F", "/PID", str(self.popen.pid)],
+                               **_subprocess_kwargs(stdout=subprocess.DEVNULL,
+                                                    stderr=subprocess.DEVNULL))
+            else:
+                os.killpg(self.popen.pid, signal.SIGTERM)
+                try:
+                    self.popen.wait(timeout)
+                except subprocess.TimeoutExpired:
+                    os.killpg(self.popen.pid, signal.SIGKILL)
+        except (OSError, subprocess.SubprocessError) as e:
+            print(f"Error stopping process: {e}")
+
+class ProcessRegistry:
+    """Launched processes by project path, so a project is never started twice."""
+
+    def __init__(self):
+        self.processes = {}  # project path -> ManagedProcess
+
+    def get(self, project_path):
+        return self.processes.get(project_path)
+
+    def running(self):
+        return {path: process for path, process in self.processes.items() if process.busy}
+
+    def launch(self, project_path, command):
+        """Start command for a project unless it is already running; return (process, started)."""
+        process = self.processes.get(project_path)
+        if process is not None and process.busy:
+            return process, False
+        process = ManagedProcess(command, project_path)
+        process.start()
+        self.processes[project_path] = process
+        return process, True
+
+    def restart(self, project_path):
+        """Stop a project's process and start its command again, off the calling thread.
+
+        Like stop_all, the stopping threads are not daemons so an exit never strands a child.
+        """
+        old = self.processes[project_path]
+        process = ManagedProcess(old.command, old.cwd)
+        # Busy from now on, so a launch while the old process stops is not a second start
+        process.starting = True
+        self.processes[project_path] = process
+        threading.Thread(target=process.start_after, args=(old,)).start()
+        return process
+
+    def stop(self, project_path):
+        process = self.processes.get(project_path)
+        if process is not None:
+            threading.Thread(target=process.stop).start()
+
+    def stop_all(self, timeout=5.0):
+        """Stop every process in parallel without waiting; return the stopping threads.
+
+        The threads are not daemons, so the interpreter finishes them before it exits.
+        """
+        threads = []
+        for process in self.running().values():
+            thread = threading.Thread(target=process.stop, args=(timeout,))
+            thread.start()
+            threads.append(thread)
+        return threads
+
+# Settings shared with the GUI's QSettings("CursorProjects", "Menu")
+ORGANIZATION = "CursorProjects"
+APPLICATION = "Menu"
+DEFAULT_PROJECTS_DIRECTORY = "C:\\code"
+
+def settings_dir():
+    """Directory Qt uses for the user-scope INI settings of this application."""
+    if os.name == "nt":
+        base = os.environ.get("APPDATA", os.path.expanduser("~"))
+    else:
+        base = os.environ.get("XDG_CONFIG_HOME") or os.path.expanduser("~/.config")
+    return os.path.join(base, ORGANIZATION)
+
+def default_index_path():
+    return os.path.join(settings_dir(), "project_index.sqlite3")
+
+def default_snapshot_path():
+    return os.path.join(settings_dir(), "grid_snapshot.json")
+
+def read_setting(key, default=None):
+    """Read a value written by the GUI's native-format QSettings without importing Qt."""
+    try:
+        if os.name == "nt":
+            import winreg
+            with winreg.OpenKey(winreg.HKEY_CURRENT_USER,
+                                f"Software\\{ORGANIZATION}\\{APPLICATION}") as key_handle:
+                return winreg.QueryValueEx(key_handle, key)[0]
+        if sys.platform == "darwin":
+            import plistlib
+            plist_path = os.path.expanduser(
+                f"~/Library/Preferences/com.{ORGANIZATION.lower()}.{APPLICATION}.plist")
+            with open(plist_path, 'rb') as f:
+                return plistlib.load(f).get(key, default)
+        parser = configparser.ConfigParser(interpolation=None)
+        parser.optionxform = str
+        parser.read(os.path.join(settings_dir(), f"{APPLICATION}.conf"), encoding='utf-8')
+        value = parser.get("General", key, fallback=None)
+        if value is None:
+            return default
+        if len(value) >= 2 and value[0] == value[-1] == '"':
+            value = value[1:-1]
+        return value.replace('\\\\', '\\')
+    except (OSError, ValueError):
+        return default
+
+# Shared index daemon: one process owns the scan and the index for every window and script
+DAEMON_PROTOCOL = 2  # bumped whenever RECORD_FIELDS changes
+DAEMON_HOST = "127.0.0.1"
+DAEMON_CONNECT_TIMEOUT = 0.5  # seconds to reach a daemon before scanning locally
+DAEMON_RESCAN_INTERVAL = 10.0  # seconds between polls of a served tree
+DAEMON_PING_INTERVAL = 30.0  # seconds a quiet subscription waits before checking its client
+
+def default_daemon_path():
+    return os.path.join(settings_dir(), "index_daemon.json")
+
+class IndexDaemonError(ValueError):
+    """The index daemon answered with an error or with something this version cannot read."""
+
+def prune_index(index, discovery):
+    """Drop index entries under every root the discovery listed but did not find; return them."""
+    stale = []
+    for root in discovery.listed_roots:
+        if root not in discovery.failed_roots:
+            stale += index.prune(root, discovery.seen_paths)
+    index.commit()
+    return stale
+
+class ServedTree:
+    """The projects under one (roots, depth) pair, kept current for every subscriber."""
+
+    def __init__(self, roots, max_depth, index):
+        self.roots = roots
+        self.max_depth = max_depth
+        self.index = index
+        self.records = {}  # project path -> record, for every valid project
+        self.subscribers = set()  # queue.SimpleQueue of events per subscribed client
+        self.lock = threading.Lock()
+        self.scanned = threading.Event()  # set once the first scan has finished
+        self.wake = threading.Event()  # set to rescan before the interval is up
+
+    def rescan(self):
+        """Walk the roots through the index and send what changed to every subscriber."""
+        roots = [root for root in self.roots if root_exists(root)]
+        discovery = ProjectDiscovery([(root, 0) for root in roots], self.index, self.max_depth)
+        found = {record.path: record for record in discovery if record.is_valid}
+        prune_index(self.index, discovery)
+        self.describe(found.values())
+        with self.lock:
+            changed = [record for path, record in found.items() if self.records.get(path) != record]
+            removed = [path for path in self.records if path not in found]
+            self.records = found
+            if changed:
+                self.publish({'event': 'changed', **encode_records(changed)})
+            if removed:
+                self.publish({'event': 'removed', 'paths': removed})
+        self.scanned.set()
+
+    def describe(self, records):
+        """Parse the READMEs no scan has described yet, so clients never have to."""
+        described = False
+        for record in records:
+            if record.description is None and record.readme_path and not record.cached:
+                info = read_readme_info(record.readme_path, record.name)
+                record.title = info['title']
+                record.description = info['description']
+                if file_mtime(record.readme_path) == record.readme_mtime:
+                    self.index.set_readme_info(record.path, record.title, record.description)
+                    described = True
+        if described:
+            self.index.commit()
+
+    def publish(self, event):
+        # Called with the lock held; encoded once for every subscriber
+        line = (json.dumps(event, ensure_ascii=False, separators=(',', ':')) + "\n").encode()
+        for subscriber in self.subscribers:
+            subscriber.put(line)
+
+    def subscribe(self):
+        """Return the current snapshot and a queue that receives every later change."""
+        subscriber = queue.SimpleQueue()
+        with self.lock:
+            snapshot = {'event': 'snapshot', **encode_records(self.records.values())}
+            self.subscribers.add(subscriber)
+        return snapshot, subscriber
+
+    def unsubscribe(self, subscriber):
+        with self.lock:
+            self.subscribers.discard(subscriber)
+
+class IndexDaemonHandler(socketserver.StreamRequestHandler):
+    """One client connection: a single JSON request line, answered with JSON event lines.
+
+    Requests are {"token", "op", "roots", "max_depth"} with op "snapshot" (send the
+    projects and close), "subscribe" (send them, then every change until the client
+    goes away) or "rescan"; "rescan": true on the others also rescans straight away.
+    """
+
+    def handle(self):
+        try:
+            request = json.loads(self.rfile.readline())
+            roots = parse_roots(request['roots'])
+            max_depth = int(request['max_depth'])
+        except (ValueError, KeyError, TypeError):
+            return self.send({'event': 'error', 'message': "malformed request"})
+        if not secrets.compare_digest(str(request.get('token', "")), self.server.daemon.token):
+            return self.send({'event': 'error', 'message': "bad token"})
+
+        tree = self.server.daemon.tree(roots, max_depth)
+        op = request.get('op')
+        if op == 'rescan' or request.get('rescan'):
+            tree.wake.set()
+        if op == 'rescan':
+            return self.send({'event': 'ok'})
+        tree.scanned.wait()
+        snapshot, subscriber = tree.subscribe()
+        try:
+            self.send(snapshot)
+            while op == 'subscribe' and not self.server.daemon.stopped.is_set():
+                try:
+                    self.wfile.write(subscriber.get(timeout=DAEMON_PING_INTERVAL))
+                except queue.Empty:
+                    self.send({'event': 'ping'})  # fails once the client has gone
+        except OSError:
+            pass
+        finally:
+            tree.unsubscribe(subscriber)
+
+    def send(self, event):
+        self.wfile.write((json.dumps(event, ensure_ascii=False, separators=(',', ':')) + "\n").encode())
+
+class IndexDaemonServer(socketserver.ThreadingTCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+class IndexDaemon:
+    """Long-lived local service that scans each requested tree once for every client.
+
+    It listens on a free localhost port; the port and a random token are written to
+    info_path, which only the user can read, so other users cannot connect. Each served
+    tree is polled every interval seconds through the index (a stat per folder when
+    nothing changed), and clients may ask for an immediate rescan.
+    """
+
+    def __init__(self, index, interval=DAEMON_RESCAN_INTERVAL, info_path=None):
+        self.index = index
+        self.interval = interval
+        self.info_path = info_path if info_path is not None else default_daemon_path()
+        self.token = secrets.token_hex(16)
+        self.trees = {}  # (roots, max_depth) -> ServedTree
+        self.lock = threading.Lock()
+        self.stopped = threading.Event()
+        self.server = IndexDaemonServer((DAEMON_HOST, 0), IndexDaemonHandler)
+        self.server.daemon = self
+
+    @property
+    def port(self):
+        return self.server.server_address[1]
+
+    def tree(self, roots, max_depth):
+        key = (tuple(roots), max_depth)
+        with self.lock:
+            tree = self.trees.get(key)
+            if tree is None:
+                tree = self.trees[key] = ServedTree(list(roots), max_depth, self.index)
+                threading.Thread(target=self.poll, args=(tree,), daemon=True).start()
+        return tree
+
+    def poll(self, tree):
+        while not self.stopped.is_set():
+            interval = self.interval
+            try:
+                tree.rescan()
+            except Exception as e:
+                print(f"Error scanning {os.pathsep.join(tree.roots)}: {e}", file=sys.stderr)
+                tree.scanned.set()  # clients get the last known projects
+                if isinstance(e, sqlite3.OperationalError) and database_locked(e):
+                    interval = min(interval, INDEX_RETRY_DELAY)  # another process is writing
+            tree.wake.wait(interval)
+            tree.wake.clear()
+
+    def write_info(self):
+        info = {'protocol': DAEMON_PROTOCOL, 'fields': RECORD_FIELDS, 'port': self.port,
+                'token': self.token, 'pid': os.getpid()}
+        os.makedirs(os.path.dirname(self.info_path), exist_ok=True)
+        temp_path = self.info_path + ".tmp"
+        fd = os.open(temp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            json.dump(info, f)
+        os.replace(temp_path, self.info_path)
+
+    def remove_info(self):
+        # Only if it is still ours: a newer daemon may have replaced it
+        try:
+            with open(self.info_path, 'r', encoding='utf-8') as f:
+                if json.load(f).get('token') != self.token:
+                    return
+            os.remove(self.info_path)
+        except (OSError, ValueError):
+            pass
+
+    def serve_forever(self):
+        self.write_info()
+        try:
+            self.server.serve_forever()
+        finally:
+            self.stopped.set()
+            for tree in list(self.trees.values()):
+                tree.wake.set()
+            self.server.server_close()
+            self.remove_info()
+
+    def shutdown(self):
+        """Stop serve_forever() from another thread."""
+        self.server.shutdown()
+
+class IndexClient:
+    """Connection to a running IndexDaemon; connect() returns None when none is running."""
+
+    def __init__(self, sock, token):
+        self.sock = sock
+        self.token = token
+        self.rfile = sock.makefile('rb')
+
+    @classmethod
+    def connect(cls, info_path=None, timeout=DAEMON_CONNECT_TIMEOUT):
+        try:
+            with open(info_path or default_daemon_path(), 'r', encoding='utf-8') as f:
+                info = json.load(f)
+            # A daemon of another version sends records this one cannot decode
+            if (info.get('protocol') != DAEMON_PROTOCOL
+                    or info.get('fields') != list(RECORD_FIELDS)):
+                return None
+            sock = socket.create_connection((DAEMON_HOST, info['port']), timeout=timeout)
+        except (OSError, ValueError, KeyError, TypeError):
+            return None  # no daemon, or a stale file left by one that crashed
+        # Scans and subscriptions may take any time once connected
+        sock.settimeout(None)
+        return cls(sock, info['token'])
+
+    def send(self, op, roots, max_depth, rescan=False):
+        request = {'token': self.token, 'op': op, 'roots': list(roots), 'max_depth': max_depth,
+                   'rescan': rescan}
+        self.sock.sendall((json.dumps(request) + "\n").encode())
+
+    def events(self):
+        """Yield (event, payload) pairs: records for snapshot and changed, paths for removed.
+
+        Raises IndexDaemonError if the other end answers with an error or is not a daemon
+        of this version (e.g. another service on the port of a stale info file).
+        """
+        for line in self.rfile:
+            try:
+                message = json.loads(line)
+                event = message.get('event')
+            except (ValueError, AttributeError):
+                raise IndexDaemonError("the index port answers with something else") from None
+            if event in ('snapshot', 'changed'):
+                records = decode_records(message)
+                if records is None:
+                    raise IndexDaemonError("the index daemon sends records of another version")
+                yield event, records
+            elif event == 'removed':
+                yield event, message['paths']
+            elif event == 'error':
+                raise IndexDaemonError(f"index daemon: {message.get('message')}")
+            elif event != 'ping':
+                yield event, None
+
+    def close(self):
+        """Close the connection; a thread blocked in events() stops."""
+        try:
+            self.sock.shutdown(socket.SHUT_RDWR)
+        except OSError:
+            pass
+        self.rfile.close()
+        self.sock.close()
+
+def fetch_served_records(roots, max_depth, info_path=None):
+    """Return the projects under roots from a running index daemon, or None if there is none."""
+    client = IndexClient.connect(info_path)
+    if client is None:
+        return None
+    try:
+        client.send('snapshot', roots, max_depth)
+        for event, records in client.events():
+            if event == 'snapshot':
+                return records
+    except (OSError, ValueError) as e:
+        print(f"Error reading from the index daemon: {e}", file=sys.stderr)
+    finally:
+        client.close()
+    return None
+
+# Command-line interface
+CLI_COMMANDS = ('scan', 'launch', 'serve')
+
+def load_project_records(roots, index=None, max_depth=DEFAULT_SCAN_DEPTH, use_daemon=False):
+    """Discover the projects under roots and return their records sorted by name.
+
+    With use_daemon, a running index daemon answers instead of the disk when there is one.
+    """
+    records = fetch_served_records(roots, max_depth) if use_daemon else None
+    if records is None:
+        discovery = ProjectDiscovery([(root, 0) for root in roots], index, max_depth)
+        records = [record for record in discovery if record.is_valid]
+        for root, error in discovery.failed_roots.items():
+            print(f"Error: {root} could not be read ({error}); showing cached projects",
+                  file=sys.stderr)
+        if index is not None:
+            prune_index(index, discovery)
+    return sorted(records, key=lambda record: record.name.lower())
+
+def describe_records(records, index=None):
+    """Parse the READMEs of records not yet described, keeping the results in the index."""
+    cache = ReadmeCache()
+    for record in records:
+        if record.description is not None or record.cached:
+            continue
+        if not record.readme_path:
+            record.title, record.description = record.name, 'No description available'
+            continue
+        info, mtime = cache.get(record.readme_path, record.name)
+        record.title, record.description = info['title'], info['description']
+        if index is not None and mtime == record.readme_mtime:
+            index.set_readme_info(record.path, record.title, record.description)
+    if index is not None:
+        index.commit()
+
+def cli_scan(args, index):
+    records = load_project_records(args.roots, index, args.depth, args.use_daemon)
+    if args.sort != 'name' and index is not None:
+        # Only the stored stats are used; they are sampled by the GUI
+        records.sort(key=activity_sort_key(args.sort, index.all_activity()))
+    if args.json:
+        describe_records(records, index)
+        fields = ('name', 'path', 'type', 'icon', 'title', 'description', 'scripts',
+                  'launch_kind', 'launch_target')
+        rows = [{field: getattr(record, field) for field in fields} for record in records]
+        for row in rows:
+            row['scripts'] = row['scripts'] or {}
+        json.dump(rows, sys.stdout, indent=2, ensure_ascii=False)
+        print()
+    else:
+        for record in records:
+            print(f"{record.name}\t{record.type}\t{record.path}")
+    return 0
+
+def cli_launch(args, index):
+    records = load_project_records(args.roots, index, args.depth, args.use_daemon)
+    matches = ([record for record in records if record.name == args.name]
+               or [record for record in records if record.name.lower() == args.name.lower()])
+    if not matches:
+        print(f"No project named {args.name} in {os.pathsep.join(args.roots)}", file=sys.stderr)
+        return 1
+    record = matches[0]
+
+    scripts = record.scripts or {}
+    if record.launch_kind == 'npm' and args.script not in scripts:
+        print(f"Choose a script with --script: {', '.join(scripts) or 'none found'}",
+              file=sys.stderr)
+        return 2
+    environment = EnvironmentResolver().resolve(record)
+    command = launch_command(record, args.script, environment)
+    if command is None:
+        print(f"Don't know how to launch {args.name}", file=sys.stderr)
+        return 1
+    if environment is not None and environment.ready is False:
+        print(f"Warning: {environment.detail}; run {environment.install_text()}",
+              file=sys.stderr)
+
+    start_process(command, record.path)
+    if index is not None:
+        ActivityTracker(index).record_launch(record.path)
+    print(f"Launched {record.name}: {' '.join(command)}")
+    return 0
+
+def cli_serve(args, index):
+    client = IndexClient.connect()
+    if client is not None:
+        client.close()
+        print("An index daemon is already running", file=sys.stderr)
+        return 1
+    daemon = IndexDaemon(index, args.interval)
+    # Start on the configured projects straight away, before the first client asks
+    daemon.tree(args.roots, args.depth)
+    print(f"Serving the project index on {DAEMON_HOST}:{daemon.port} (Ctrl+C to stop)")
+    try:
+        daemon.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+def main(argv=None):
+    # --root and --depth are accepted before or after the command; after it they only
+    # override what was given before it
+    root_help = "projects directory; repeat for several (defaults to the GUI setting)"
+    depth_help = "how deep to look for nested projects"
+    scope_parser = argparse.ArgumentParser(add_help=False)
+    scope_parser.add_argument("--root", action="append", dest="roots", default=argparse.SUPPRESS,
+                              help=root_help)
+    scope_parser.add_argument("--depth", type=int, default=argparse.SUPPRESS, help=depth_help)
+
+    parser = argparse.ArgumentParser(prog="menu_app", description="Scan and launch projects.")
+    parser.add_argument("--root", action="append", dest="roots", help=root_help)
+    parser.add_argument("--depth", type=int, help=depth_help)
+    parser.add_argument("--no-index", action="store_true", help="ignore the persistent scan cache")
+    parser.add_argument("--no-daemon", action="store_true",
+                        help="scan here even when an index daemon is running")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    scan_parser = subparsers.add_parser("scan", parents=[scope_parser],
+                                        help="list the projects in the projects directory")
+    scan_parser.add_argument("--json", action="store_true", help="print records as JSON")
+    scan_parser.add_argument("--sort", choices=SORT_MODES, default='name',
+                             help="order by recent activity, launch count or name")
+    scan_parser.add_argument("--profile", action="store_true",
+                             help="print a per-phase and per-project cost report to stderr")
+
+    launch_parser = subparsers.add_parser("launch", parents=[scope_parser],
+                                          help="launch a project by folder name")
+    launch_parser.add_argument("name")
+    launch_parser.add_argument("--script", help="npm script to run for Node.js projects")
+
+    serve_parser = subparsers.add_parser(
+        "serve", parents=[scope_parser],
+        help="keep the projects scanned for every menu window and command")
+    serve_parser.add_argument("--interval", type=float, default=DAEMON_RESCAN_INTERVAL,
+                              help="seconds between rescans of each served projects directory")
+
+    args = parser.parse_args(argv)
+    if args.roots is None:
+        args.roots = parse_roots(read_setting("projects_directory", DEFAULT_PROJECTS_DIRECTORY))
+    if args.depth is None:
+        args.depth = int(read_setting("scan_depth", DEFAULT_SCAN_DEPTH))
+    missing = [root for root in args.roots if not root_exists(root)]
+    for root in missing:
+        print(f"Error: {root} directory not found", file=sys.stderr)
+    args.roots = [root for root in args.roots if root not in missing]
+    if not args.roots:
+        return 1
+
+    if args.command == 'serve':
+        return cli_serve(args, ProjectIndex(default_index_path()))
+    index = None if args.no_index else ProjectIndex(default_index_path())
+    try:
+        # A profile or an uncached scan has to walk the disk here
+        args.use_daemon = not (args.no_daemon or args.no_index or getattr(args, 'profile', False))
+        if args.command == 'scan':
+            profiler.enabled = profiler.enabled or args.profile
+            result = cli_scan(args, index)
+            if profiler.enabled:
+                json.dump(profiler.report(), sys.stderr, indent=2)
+                print(file=sys.stderr)
+            return result
+        return cli_launch(args, index)
+    finally:
+        if index is not None:
+            index.close()
+
+if __name__ == "__main__":
+    sys.exit(main())